@@ -0,0 +1,168 @@
+"""Latência de reexecução e memória residente com várias sessões do dashboard ao mesmo tempo.
+
+Sobe N sessões do dashboard (streamlit.testing AppTest) contra uma planilha
+falsa em memória, abre a mesma página em todas e reexecuta as N sessões em
+paralelo, em threads, como o servidor do Streamlit faz, por várias rodadas.
+Uma thread à parte amostra o RSS do processo durante as rodadas (com psutil,
+se instalado, ou pelo /proc no Linux).
+
+As sessões são criadas uma a uma: o AppTest não suporta a primeira execução
+de várias sessões ao mesmo tempo, só as reexecuções.
+
+O AppTest guarda as mensagens de cada execução em ciclos de referência, que
+só o coletor completo libera. Por isso o RSS é medido também depois de um
+gc.collect() a cada rodada; essa é a medida comparável entre versões.
+
+    python benchmarks/sessoes_concorrentes.py --sessoes 20 --pagina "📅 Calendário de Vencimentos"
+
+Para comparar com outra versão, aponte --app para o dashboard.py de outra
+cópia do repositório (por exemplo, um git worktree do commit anterior).
+"""
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MESES_PT = ['JANEIRO', 'FEVEREIRO', 'MARÇO', 'ABRIL', 'MAIO', 'JUNHO', 'JULHO', 'AGOSTO', 'SETEMBRO', 'OUTUBRO', 'NOVEMBRO', 'DEZEMBRO']
+CABECALHO_CLIENTES = ['Nome', 'Celular', 'Email', 'Plano', 'Início do Acompanhamento', 'Vencimento do Contrato']
+CABECALHO_OPCOES = ['SITUAÇÃO', 'ATIVO', 'OPÇÃO', 'STRIKE', 'RECOMENDAÇÃO', 'QUANTIDADE', 'PREÇO EXECUTADO']
+
+
+class AbaFalsa:
+    def __init__(self, title, valores):
+        self.title = title
+        self.valores = valores
+
+    def get_all_values(self):
+        return self.valores
+
+
+class PlanilhaFalsa:
+    def __init__(self, abas):
+        self.abas = abas
+
+    def worksheets(self):
+        return self.abas
+
+    def worksheet(self, titulo):
+        return next(aba for aba in self.abas if aba.title == titulo)
+
+
+def montar_planilha(clientes, pernas_por_cliente, ativos_por_cliente=5, semente=0):
+    """Planilha no layout real: aba 'Clientes' e uma aba por cliente com investimentos e blocos mensais de opções."""
+    aleatorio = random.Random(semente)
+    linhas_clientes = [CABECALHO_CLIENTES]
+    abas = []
+    for c in range(clientes):
+        nome = f'Cliente {c}'
+        linhas_clientes.append([nome, f'2199{c:07d}', f'c{c}@exemplo.com', aleatorio.choice(['Eleva', 'Alavanca']), '01/02/2024', '01/02/2025'])
+
+        grade = [['CÓDIGO', 'QUANTIDADE', 'PM', 'VALOR INVESTIDO'] + [''] * 8]
+        for i in range(ativos_por_cliente):
+            grade.append([f'TICK{i}', str(100 * (i + 1)), '10,50', f'{1050 * (i + 1)},00'] + [''] * 8)
+        for mes in (10, 11, 12):
+            grade.append([''] * 5 + [MESES_PT[mes - 1]] + [''] * 6)
+            grade.append([''] * 12)
+            grade.append([''] * 5 + CABECALHO_OPCOES)
+            for j in range(pernas_por_cliente // 3 + 1):
+                ativo = aleatorio.choice(['PETR', 'VALE', 'BBAS', 'ITUB'])
+                letra = chr(ord('A') + mes - 1) if aleatorio.random() < .5 else chr(ord('M') + mes - 1)
+                semanal = aleatorio.choice(['', '', 'W1', 'W2', 'W4'])
+                grade.append([''] * 5 + [
+                    aleatorio.choice(['Aberta', 'Fechada']), f'{ativo}4', f'{ativo}{letra}{30 + j}{semanal}',
+                    f'{aleatorio.randint(20, 40)},00', aleatorio.choice(['Compra', 'Venda']),
+                    str(aleatorio.randint(1, 10) * 100), f'{aleatorio.random():.2f}'.replace('.', ','),
+                ])
+        abas.append(AbaFalsa(nome, grade))
+    return PlanilhaFalsa([AbaFalsa('Clientes', linhas_clientes)] + abas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede reexecuções e memória com várias sessões simultâneas do dashboard.")
+    parser.add_argument('--app', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboard.py'))
+    parser.add_argument('--pagina', default="💰 Carteira de Investimentos")
+    parser.add_argument('--sessoes', type=int, default=20)
+    parser.add_argument('--rodadas', type=int, default=5)
+    parser.add_argument('--clientes', type=int, default=300)
+    parser.add_argument('--pernas', type=int, default=90, help="Pernas de opções por cliente")
+    args = parser.parse_args(argv)
+
+    # O dashboard importa dados.py da sua própria pasta; a conexão é trocada pela planilha falsa
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.app)))
+    import dados
+    from streamlit.testing.v1 import AppTest
+
+    planilha = montar_planilha(args.clientes, args.pernas)
+    dados.conectar_gsheets = lambda: planilha
+    # Sempre a planilha falsa, mesmo que haja um instantâneo do CLI de resumos na pasta
+    dados.CAMINHO_INSTANTANEO = None
+
+    if psutil is not None:
+        processo = psutil.Process()
+        rss_mb = lambda: processo.memory_info().rss / 2**20
+    else:
+        # Sem psutil, lê o RSS do /proc (só Linux)
+        pagina_mb = os.sysconf('SC_PAGE_SIZE') / 2**20
+        rss_mb = lambda: int(open('/proc/self/statm').read().split()[1]) * pagina_mb
+
+    def abrir_sessao():
+        sessao = AppTest.from_file(args.app, default_timeout=600)
+        sessao.run()
+        sessao.sidebar.radio[0].set_value(args.pagina).run()
+        assert not sessao.exception, sessao.exception
+        return sessao
+
+    # Primeira sessão descartada: carrega a planilha e importa as páginas
+    abrir_sessao()
+    gc.collect()
+    rss_base = rss_mb()
+
+    pico = [rss_base]
+    amostrando = threading.Event()
+    amostrando.set()
+
+    def amostrar():
+        while amostrando.is_set():
+            pico[0] = max(pico[0], rss_mb())
+            time.sleep(0.002)
+
+    threading.Thread(target=amostrar, daemon=True).start()
+    sessoes = [abrir_sessao() for _ in range(args.sessoes)]
+    rss_sessoes = rss_mb()
+
+    def reexecutar(sessao):
+        inicio = time.perf_counter()
+        sessao.run()
+        assert not sessao.exception, sessao.exception
+        return (time.perf_counter() - inicio) * 1000
+
+    latencias, rodadas, rss_rodadas = [], [], []
+    with ThreadPoolExecutor(max_workers=args.sessoes) as executor:
+        for _ in range(args.rodadas):
+            inicio = time.perf_counter()
+            latencias.extend(executor.map(reexecutar, sessoes))
+            rodadas.append((time.perf_counter() - inicio) * 1000)
+            gc.collect()
+            rss_rodadas.append(rss_mb())
+    amostrando.clear()
+
+    print(f"app={args.app}")
+    print(f"pagina={args.pagina} sessoes={args.sessoes} rodadas={args.rodadas} clientes={args.clientes} pernas_por_cliente={args.pernas}")
+    print(f"reexecucao_ms mediana={statistics.median(latencias):.0f} p90={sorted(latencias)[int(.9 * len(latencias))]:.0f} "
+          f"rodada_ms mediana={statistics.median(rodadas):.0f}")
+    print(f"rss_mb base={rss_base:.0f} com_sessoes={rss_sessoes:.0f} pico={pico[0]:.0f} "
+          f"apos_gc_por_rodada={'/'.join(f'{r:.0f}' for r in rss_rodadas)}")
+
+
+if __name__ == '__main__':
+    main()
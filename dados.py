@@ -0,0 +1,557 @@
+"""Camada de dados do dashboard: leitura, conversão e escrita da Planilha Google.
+
+A leitura e as conversões ficam no pacote ``nucleo``, sem Streamlit; aqui
+ficam o cache partilhado entre sessões, as escritas e as mensagens de erro.
+"""
+import streamlit as st
+import pandas as pd
+import numpy as np
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+
+from nucleo.conversao import formatar_valor_brl, identificar_tipo_opcao, calcular_data_vencimento, ordenar_meses
+from nucleo.planilha import conectar_planilha, carregar_conjunto, carregar_instantaneo_recente, CAMINHO_INSTANTANEO
+
+# As sessões recebem vistas rasas do conjunto partilhado; com copy-on-write,
+# qualquer escrita numa vista copia só o que mudou e nunca altera o original.
+# No pandas >= 3 o copy-on-write é sempre ativo.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# --- RECONCILIAÇÃO DE EDIÇÕES DA CARTEIRA DE INVESTIMENTOS ---
+
+COLUNAS_INVESTIMENTOS = ['Código', 'Quantidade', 'Preço Médio', 'Valor Investido']
+
+def formatar_celula_planilha(valor, monetario=False):
+    """Texto gravado numa célula da planilha (vírgula decimal nos valores monetários)."""
+    if valor is None or pd.isna(valor) or valor == '': return ''
+    if pd.api.types.is_number(valor):
+        if monetario: return f'{float(valor):.2f}'.replace('.', ',')
+        if float(valor).is_integer(): return str(int(valor))
+    return str(valor).strip()
+
+def codigos_duplicados(df_carteira):
+    """Códigos que aparecem em mais de uma linha da carteira (linhas sem código não contam)."""
+    if df_carteira is None or df_carteira.empty or 'Código' not in df_carteira.columns:
+        return []
+    codigos = df_carteira['Código'].astype('string').str.strip()
+    codigos = codigos[(codigos.fillna('') != '').to_numpy()]
+    return sorted(codigos[codigos.duplicated()].unique().tolist())
+
+def carteira_por_codigo(df_carteira):
+    """Valores numéricos da carteira indexados pelo código (linhas sem código são ignoradas).
+
+    Levanta ValueError se um código se repete: o código é a identidade da
+    linha na planilha e não haveria como saber qual das linhas mudou.
+    """
+    colunas_valores = COLUNAS_INVESTIMENTOS[1:]
+    if df_carteira is None or df_carteira.empty:
+        return pd.DataFrame(columns=colunas_valores, index=pd.Index([], name='Código'), dtype='float64')
+
+    df = df_carteira.reindex(columns=COLUNAS_INVESTIMENTOS)
+    codigos = df['Código'].astype('string').str.strip()
+    valores = df[colunas_valores].apply(pd.to_numeric, errors='coerce').astype('float64')
+    valores.index = pd.Index(codigos, name='Código')
+    valores = valores[(codigos.fillna('') != '').to_numpy()]
+    if valores.index.has_duplicates:
+        repetidos = sorted(valores.index[valores.index.duplicated()].unique())
+        raise ValueError(f"Código repetido na carteira: {', '.join(repetidos)}")
+    return valores
+
+def formatar_linhas_investimento(valores):
+    """Linhas reconciliadas como texto de planilha, ainda indexadas pelo código."""
+    return pd.DataFrame({
+        'Quantidade': valores['Quantidade'].map(formatar_celula_planilha),
+        'Preço Médio': valores['Preço Médio'].map(lambda v: formatar_celula_planilha(v, monetario=True)),
+        'Valor Investido': valores['Valor Investido'].map(lambda v: formatar_celula_planilha(v, monetario=True)),
+    }, index=valores.index)
+
+def reconciliar_carteira(df_original, df_editado):
+    """Compara a carteira mostrada no editor com a devolvida por ele, usando o código como identidade.
+
+    Devolve {'inseridas', 'atualizadas', 'removidas'}: os dois primeiros como
+    DataFrames de texto indexados pelo código, o último como lista de códigos.
+    Mudar o código de uma linha conta como remoção do antigo e inserção do novo;
+    códigos repetidos levantam ValueError (ver codigos_duplicados).
+    A comparação é vetorizada; só as linhas alteradas são formatadas.
+    """
+    antes = carteira_por_codigo(df_original)
+    depois = carteira_por_codigo(df_editado)
+
+    comuns = depois.index.intersection(antes.index, sort=False)
+    # Compara como a planilha guarda: centavos nos valores, NaN igual a NaN
+    valores_antes = antes.loc[comuns].to_numpy().round(2)
+    valores_depois = depois.loc[comuns].to_numpy().round(2)
+    iguais = (valores_antes == valores_depois) | (np.isnan(valores_antes) & np.isnan(valores_depois))
+    alteradas = comuns[~iguais.all(axis=1)]
+
+    return {
+        'inseridas': formatar_linhas_investimento(depois.loc[depois.index.difference(antes.index, sort=False)]),
+        'atualizadas': formatar_linhas_investimento(depois.loc[alteradas]),
+        'removidas': antes.index.difference(depois.index, sort=False).tolist(),
+    }
+
+# --- FUNÇÕES DE CONEXÃO E MANIPULAÇÃO DO GOOGLE SHEETS ---
+
+def conectar_gsheets():
+    return conectar_planilha(st.secrets)
+
+@st.cache_resource(ttl=600, show_spinner="A carregar dados da planilha...")
+def carregar_conjunto_compartilhado():
+    """Lê a planilha inteira uma vez por processo e devolve (df_clientes, carteiras, df_todas_opcoes, versao).
+
+    Se o CLI de resumos deixou um instantâneo recente, lido depois da última
+    gravação deste processo, ele é usado no lugar da planilha.
+
+    O resultado é partilhado por todas as sessões sem cópia. Os DataFrames em
+    si continuam mutáveis: nada os tranca, e uma escrita direta neles chegaria
+    a todas as sessões. Quem protege o conjunto é carregar_dados_publicos,
+    que entrega vistas copy-on-write; só elas devem sair deste módulo.
+    """
+    try:
+        conjunto = carregar_instantaneo_recente(CAMINHO_INSTANTANEO, posterior_a=registro_gravacoes()['ultima'])
+        if conjunto is None:
+            conjunto = carregar_conjunto(conectar_gsheets(), avisar=st.warning)
+        df_clientes, dados_completos_clientes, df_todas_opcoes = conjunto
+    except Exception as e:
+        st.error(f"Não foi possível carregar os dados. Verifique a conexão e as permissões. Erro: {e}")
+        return pd.DataFrame(), {}, pd.DataFrame(), None
+
+    # Identifica esta carga; os cálculos derivados são memorizados por versão
+    versao = datetime.now().isoformat()
+    anotar_carga_cubo()
+    return df_clientes, dados_completos_clientes, df_todas_opcoes, versao
+
+class CarteirasSomenteLeitura(Mapping):
+    """Carteiras por cliente do conjunto partilhado, entregues como vistas copy-on-write.
+
+    Cada vista fica registada nos blocos partilhados, por isso é criada só no
+    primeiro acesso a cada cliente e reaproveitada durante a execução.
+    """
+
+    def __init__(self, carteiras):
+        self._carteiras = carteiras
+        self._vistas = {}
+
+    def __getitem__(self, nome):
+        if nome not in self._vistas:
+            self._vistas[nome] = {tipo: df.copy(deep=False) for tipo, df in self._carteiras[nome].items()}
+        return self._vistas[nome]
+
+    def __contains__(self, nome):
+        return nome in self._carteiras
+
+    def __iter__(self):
+        return iter(self._carteiras)
+
+    def __len__(self):
+        return len(self._carteiras)
+
+def carregar_dados_publicos():
+    """Vistas sem cópia do conjunto partilhado: (df_clientes, carteiras, df_todas_opcoes, versao).
+
+    Os DataFrames podem ser alterados pela sessão; o copy-on-write copia só
+    as colunas escritas e o conjunto partilhado continua intacto.
+    """
+    df_clientes, carteiras, df_todas_opcoes, versao = carregar_conjunto_compartilhado()
+    return df_clientes.copy(deep=False), CarteirasSomenteLeitura(carteiras), df_todas_opcoes.copy(deep=False), versao
+
+@st.cache_resource(show_spinner=False)
+def registro_gravacoes():
+    """Hora da última gravação na planilha feita por este processo."""
+    return {'ultima': None}
+
+def invalidar_dados():
+    """Descarta o conjunto partilhado; a próxima execução de qualquer sessão relê a planilha.
+
+    Instantâneos lidos antes desta gravação deixam de ser aceitos.
+    """
+    registro_gravacoes()['ultima'] = datetime.now()
+    carregar_conjunto_compartilhado.clear()
+
+def adicionar_cliente_na_planilha(dados_cliente, df_carteira):
+    try:
+        spreadsheet = conectar_gsheets()
+        
+        sheet_clientes = spreadsheet.worksheet("Clientes")
+        # Calcula o vencimento inicial
+        vencimento_inicial = dados_cliente['inicio'] + pd.DateOffset(years=1)
+
+        nova_linha = [
+            dados_cliente['nome'], dados_cliente['celular'], dados_cliente['email'],
+            dados_cliente['plano'], dados_cliente['inicio'].strftime('%d/%m/%Y'),
+            vencimento_inicial.strftime('%d/%m/%Y') # Adiciona o vencimento
+        ]
+        sheet_clientes.append_row(nova_linha, value_input_option='USER_ENTERED')
+        
+        nova_aba = spreadsheet.add_worksheet(title=dados_cliente['nome'], rows=max(100, len(df_carteira) + 10), cols=20)
+        
+        headers_investimentos = [['CÓDIGO', 'QUANTIDADE', 'PM', 'VALOR INVESTIDO']]
+        mes_atual_nome = datetime.now().strftime('%B').upper()
+        headers_opcoes = [[mes_atual_nome], [], ['SITUAÇÃO', 'ATIVO', 'OPÇÃO', 'STRIKE', 'RECOMENDAÇÃO', 'QUANTIDADE', 'PREÇO EXECUTADO']]
+
+        nova_aba.update(range_name='A1', values=headers_investimentos)
+        
+        if not df_carteira.empty:
+            df_para_salvar = df_carteira.copy()
+            colunas_monetarias = ['Preço Médio', 'Valor Investido']
+            for col in colunas_monetarias:
+                if col in df_para_salvar.columns:
+                    df_para_salvar[col] = df_para_salvar[col].apply(
+                        lambda x: f'{x:.2f}'.replace('.', ',') if pd.notna(x) and isinstance(x, (int, float)) else x
+                    )
+            nova_aba.update(range_name='A2', values=df_para_salvar.astype(str).values.tolist())
+        
+        nova_aba.update(range_name='F5', values=headers_opcoes)
+        
+        return True
+    except Exception as e:
+        st.error(f"Ocorreu um erro ao guardar os dados: {e}")
+        return False
+
+def atualizar_carteira_investimentos(nome_cliente, alteracoes):
+    """Aplica na aba do cliente só as linhas inseridas, atualizadas e removidas pela reconciliação.
+
+    As linhas são localizadas pelo código na coluna A; removidas ficam em branco
+    (as opções partilham as mesmas linhas nas colunas F em diante) e são
+    reaproveitadas pelas inserções. Todas as escritas vão num único batch_update.
+    Nada é gravado se um código alterado aparece em mais de uma linha da aba
+    ou se uma inserção cairia sobre um código que já tem linha (por exemplo,
+    um ativo escondido pelo filtro do editor).
+    """
+    try:
+        spreadsheet = conectar_gsheets()
+        sheet_cliente = spreadsheet.worksheet(nome_cliente)
+
+        codigos = sheet_cliente.col_values(1)
+        if 'CÓDIGO' not in codigos:
+            raise ValueError(f"Cabeçalho 'CÓDIGO' não encontrado na aba '{nome_cliente}'.")
+        inicio = codigos.index('CÓDIGO') + 1
+
+        linha_por_codigo = {}
+        codigos_repetidos = set()
+        linhas_livres = []
+        for posicao in range(inicio, len(codigos)):
+            codigo = codigos[posicao].strip()
+            if not codigo:
+                linhas_livres.append(posicao + 1)
+            elif codigo in linha_por_codigo:
+                codigos_repetidos.add(codigo)
+            else:
+                linha_por_codigo[codigo] = posicao + 1
+        proxima_linha = len(codigos) + 1
+
+        alterados = set(alteracoes['removidas']) | set(alteracoes['atualizadas'].index) | set(alteracoes['inseridas'].index)
+        ambiguos = sorted(alterados & codigos_repetidos)
+        if ambiguos:
+            raise ValueError(f"Código repetido na aba '{nome_cliente}': {', '.join(ambiguos)}. Corrija a planilha antes de editar.")
+        existentes = sorted(codigo for codigo in alteracoes['inseridas'].index if codigo in linha_por_codigo)
+        if existentes:
+            raise ValueError(f"Código já existe na aba '{nome_cliente}': {', '.join(existentes)}. Edite a linha existente em vez de inserir outra.")
+
+        escritas = {}
+        for codigo in alteracoes['removidas']:
+            linha = linha_por_codigo.pop(codigo, None)
+            if linha is not None:
+                escritas[linha] = [''] * len(COLUNAS_INVESTIMENTOS)
+                linhas_livres.append(linha)
+        linhas_livres.sort()
+
+        for df_linhas in (alteracoes['atualizadas'], alteracoes['inseridas']):
+            for codigo, valores in zip(df_linhas.index, df_linhas.values.tolist()):
+                linha = linha_por_codigo.get(codigo)
+                if linha is None:
+                    if linhas_livres:
+                        linha = linhas_livres.pop(0)
+                    else:
+                        linha = proxima_linha
+                        proxima_linha += 1
+                    linha_por_codigo[codigo] = linha
+                escritas[linha] = [codigo] + valores
+
+        if not escritas:
+            return True
+
+        ultima_linha = max(escritas)
+        if ultima_linha > sheet_cliente.row_count:
+            sheet_cliente.add_rows(ultima_linha - sheet_cliente.row_count)
+
+        sheet_cliente.batch_update(
+            [{'range': f'A{linha}:D{linha}', 'values': [valores]} for linha, valores in sorted(escritas.items())],
+            value_input_option='USER_ENTERED'
+        )
+        return True
+    except Exception as e:
+        st.error(f"Ocorreu um erro ao atualizar a carteira: {e}")
+        return False
+
+def atualizar_carteira_opcoes(nome_cliente, df_nova_carteira_opcoes):
+    try:
+        spreadsheet = conectar_gsheets()
+        sheet_cliente = spreadsheet.worksheet(nome_cliente)
+        
+        sheet_cliente.batch_clear(['F1:L200'])
+        
+        if not df_nova_carteira_opcoes.empty:
+            mes_map_inv = {
+                1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril', 5: 'Maio', 6: 'Junho',
+                7: 'Julho', 8: 'Agosto', 9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
+            }
+            # Adiciona a coluna Mês se não existir (caso o usuário adicione uma nova linha)
+            if 'Mês' not in df_nova_carteira_opcoes.columns:
+                df_nova_carteira_opcoes['Mês'] = datetime.now().strftime('%B').capitalize()
+
+            df_nova_carteira_opcoes['num_mes'] = df_nova_carteira_opcoes['Mês'].str.capitalize().map({v: k for k, v in mes_map_inv.items()})
+            grupos_por_mes = sorted(df_nova_carteira_opcoes.groupby('Mês'), key=lambda x: x[1]['num_mes'].iloc[0])
+
+            linha_atual = 5
+
+            for mes, grupo in grupos_por_mes:
+                sheet_cliente.update(range_name=f'F{linha_atual}', values=[[mes.upper()]])
+                linha_atual += 2
+
+                cabecalho = [['SITUAÇÃO', 'ATIVO', 'OPÇÃO', 'STRIKE', 'RECOMENDAÇÃO', 'QUANTIDADE', 'PREÇO EXECUTADO']]
+                sheet_cliente.update(range_name=f'F{linha_atual}', values=cabecalho)
+                linha_atual += 1
+                
+                grupo_para_salvar = grupo.copy()
+                colunas_monetarias = ['Strike', 'Preço Executado']
+                for col in colunas_monetarias:
+                    if col in grupo_para_salvar.columns:
+                         grupo_para_salvar[col] = grupo_para_salvar[col].apply(
+                            lambda x: f'{x:.2f}'.replace('.', ',') if pd.notna(x) and isinstance(x, (int, float)) else x
+                        )
+                
+                # Garante que colunas extras não sejam salvas
+                colunas_para_manter = ['Situação', 'Ativo', 'Opção', 'Strike', 'Recomendação', 'Quantidade', 'Preço Executado']
+                dados_mes = grupo_para_salvar[colunas_para_manter].astype(str).values.tolist()
+                sheet_cliente.update(range_name=f'F{linha_atual}', values=dados_mes, value_input_option='USER_ENTERED')
+                linha_atual += len(dados_mes) + 2
+
+        registrar_opcoes_gravadas(nome_cliente)
+        return True
+    except Exception as e:
+        st.error(f"Ocorreu um erro ao atualizar a carteira de opções: {e}")
+        return False
+
+# --- NOVA FUNÇÃO PARA ATUALIZAR A LISTA DE CLIENTES ---
+def atualizar_lista_clientes(df_clientes_atualizado):
+    """Atualiza a lista de clientes na Planilha Google."""
+    try:
+        spreadsheet = conectar_gsheets()
+        sheet_clientes = spreadsheet.worksheet("Clientes")
+
+        # Prepara o DataFrame para ser salvo
+        df_para_salvar = df_clientes_atualizado.copy()
+        
+        # Garante que apenas as colunas originais sejam salvas
+        colunas_originais = ['Nome', 'Celular', 'Email', 'Plano', 'Início do Acompanhamento', 'Vencimento do Contrato']
+        df_para_salvar = df_para_salvar[colunas_originais]
+
+        # Formata as datas para o formato string esperado pela planilha
+        df_para_salvar['Início do Acompanhamento'] = pd.to_datetime(df_para_salvar['Início do Acompanhamento']).dt.strftime('%d/%m/%Y')
+        df_para_salvar['Vencimento do Contrato'] = pd.to_datetime(df_para_salvar['Vencimento do Contrato']).dt.strftime('%d/%m/%Y')
+
+        # Limpa a aba inteira e reescreve cabeçalho e dados
+        sheet_clientes.clear() 
+        sheet_clientes.update([df_para_salvar.columns.values.tolist()] + df_para_salvar.values.tolist(), value_input_option='USER_ENTERED')
+        
+        return True
+    except Exception as e:
+        st.error(f"Ocorreu um erro ao atualizar a lista de clientes: {e}")
+        return False
+
+# --- CUBO DE EXPOSIÇÃO EM OPÇÕES ---
+
+DIMENSOES_CUBO = ['Cliente', 'Ativo', 'Tipo', 'Data de Vencimento', 'Situação']
+MEDIDAS_CUBO = ['Quantidade', 'Notional', 'Prêmio', 'Pernas']
+
+def agregar_pernas(df_pernas):
+    """Agrega pernas de opções nas dimensões do cubo com um único groupby vetorizado."""
+    if df_pernas.empty:
+        return pd.DataFrame(columns=DIMENSOES_CUBO + MEDIDAS_CUBO)
+
+    quantidade = pd.to_numeric(df_pernas['Quantidade'], errors='coerce').astype('float64')
+    strike = pd.to_numeric(df_pernas['Strike'], errors='coerce').astype('float64')
+    preco = pd.to_numeric(df_pernas['Preço Executado'], errors='coerce').astype('float64')
+
+    base = df_pernas[DIMENSOES_CUBO].assign(
+        Quantidade=quantidade,
+        Notional=quantidade * strike,
+        Prêmio=quantidade * preco,
+    )
+    # sum + size custa menos que .agg com agregações nomeadas, o que pesa nas
+    # reagregações de um único cliente
+    grupos = base.groupby(DIMENSOES_CUBO, sort=False, dropna=False)
+    cubo = grupos[['Quantidade', 'Notional', 'Prêmio']].sum()
+    cubo['Pernas'] = grupos.size()
+    return cubo.reset_index()
+
+def construir_cubo_exposicao(df_todas_opcoes):
+    """Cubo Cliente × Ativo × Tipo × Vencimento × Situação com quantidade, notional, prêmio e número de pernas."""
+    return agregar_pernas(df_todas_opcoes)
+
+def atualizar_cubo_cliente(cubo, nome_cliente, df_opcoes_cliente):
+    """Substitui só as células de um cliente, reagregando as pernas da sua carteira nova."""
+    restante = cubo[cubo['Cliente'] != nome_cliente]
+    if df_opcoes_cliente is None or df_opcoes_cliente.empty:
+        return restante.reset_index(drop=True)
+
+    pernas = df_opcoes_cliente.assign(Cliente=nome_cliente)
+    if 'Tipo' not in pernas.columns:
+        pernas['Tipo'] = pernas['Opção'].apply(identificar_tipo_opcao)
+    if 'Data de Vencimento' not in pernas.columns:
+        pernas['Data de Vencimento'] = pernas.apply(calcular_data_vencimento, axis=1)
+        pernas = pernas.dropna(subset=['Data de Vencimento'])
+        pernas['Data de Vencimento'] = pd.to_datetime(pernas['Data de Vencimento'])
+
+    return pd.concat([restante, agregar_pernas(pernas)], ignore_index=True)
+
+COLUNAS_PERNAS_CUBO = DIMENSOES_CUBO + ['Quantidade', 'Strike', 'Preço Executado']
+
+def trechos_clientes(df_pernas, clientes):
+    """(início, fim) das linhas de cada cliente, em ordem; None se algum não tem linhas ou elas não são contíguas."""
+    trechos = []
+    for nome_cliente in clientes:
+        posicoes = np.flatnonzero((df_pernas['Cliente'] == nome_cliente).to_numpy(dtype=bool, na_value=False))
+        if len(posicoes) == 0 or posicoes[-1] - posicoes[0] + 1 != len(posicoes):
+            return None
+        trechos.append((int(posicoes[0]), int(posicoes[-1]) + 1))
+    return sorted(trechos)
+
+def pernas_iguais_fora_dos_clientes(df_antes, df_depois, clientes):
+    """Confere se as pernas de todos os outros clientes são as mesmas nas duas cargas.
+
+    O carregamento monta as pernas de cada cliente em linhas seguidas, então
+    basta comparar, coluna a coluna, os trechos entre as linhas dos clientes
+    pedidos. Sem esse layout (cliente sem pernas, linhas espalhadas) a
+    resposta é False e o cubo é montado do zero.
+    """
+    if df_antes.empty or df_depois.empty:
+        return False
+    trechos_antes, trechos_depois = trechos_clientes(df_antes, clientes), trechos_clientes(df_depois, clientes)
+    if trechos_antes is None or trechos_depois is None:
+        return False
+
+    limites_antes = [0] + [p for trecho in trechos_antes for p in trecho] + [len(df_antes)]
+    limites_depois = [0] + [p for trecho in trechos_depois for p in trecho] + [len(df_depois)]
+    for k in range(0, len(limites_antes), 2):
+        inicio_antes, fim_antes = limites_antes[k], limites_antes[k + 1]
+        inicio_depois, fim_depois = limites_depois[k], limites_depois[k + 1]
+        if fim_antes - inicio_antes != fim_depois - inicio_depois:
+            return False
+        for coluna in COLUNAS_PERNAS_CUBO:
+            antes = df_antes[coluna].iloc[inicio_antes:fim_antes].reset_index(drop=True)
+            depois = df_depois[coluna].iloc[inicio_depois:fim_depois].reset_index(drop=True)
+            if not antes.equals(depois):
+                return False
+    return True
+
+@st.cache_resource(show_spinner=False)
+def registro_cubo_exposicao():
+    """Último cubo montado e as pernas de onde saiu, partilhados entre sessões, e os clientes com opções gravadas desde então."""
+    return {'trava': threading.Lock(), 'versao': None, 'cubo': None, 'pernas': None, 'clientes_alterados': set(), 'gravacao_pendente': False}
+
+def registrar_opcoes_gravadas(nome_cliente):
+    """Marca a próxima releitura como pedida pela gravação das opções deste cliente."""
+    registro = registro_cubo_exposicao()
+    with registro['trava']:
+        registro['clientes_alterados'].add(nome_cliente)
+        registro['gravacao_pendente'] = True
+
+def anotar_carga_cubo():
+    """Chamada a cada leitura da planilha: só uma releitura pedida por gravação de opções mantém o último cubo.
+
+    Nas releituras pelo ttl ou depois de outras gravações, o cubo guardado é
+    descartado e a próxima versão monta o cubo do zero.
+    """
+    registro = registro_cubo_exposicao()
+    with registro['trava']:
+        if not registro['gravacao_pendente']:
+            registro.update(cubo=None, pernas=None, clientes_alterados=set())
+        registro['gravacao_pendente'] = False
+
+def cubo_exposicao_da_versao(versao, df_todas_opcoes):
+    """Cubo da versão pedida, levando adiante o último cubo montado.
+
+    Só as carteiras de opções gravadas pelo dashboard desde então são
+    reagregadas, a partir dos dados relidos, e só se as pernas de todos os
+    outros clientes não mudaram desde o cubo guardado; uma edição feita por
+    fora da aplicação obriga a montar o cubo do zero. Também é montado do zero
+    quando não há cubo guardado (primeira carga, releitura pelo ttl ou por
+    gravações que não são de opções).
+    """
+    registro = registro_cubo_exposicao()
+    with registro['trava']:
+        if registro['versao'] == versao:
+            return registro['cubo']
+        if registro['versao'] is not None and versao is not None and versao < registro['versao']:
+            # Sessão ainda na versão anterior: monta à parte, sem mexer no cubo guardado
+            return construir_cubo_exposicao(df_todas_opcoes)
+
+        if registro['cubo'] is not None and pernas_iguais_fora_dos_clientes(registro['pernas'], df_todas_opcoes, registro['clientes_alterados']):
+            cubo = registro['cubo']
+            for nome_cliente in registro['clientes_alterados']:
+                cubo = atualizar_cubo_cliente(cubo, nome_cliente, df_todas_opcoes[df_todas_opcoes['Cliente'] == nome_cliente])
+        else:
+            cubo = construir_cubo_exposicao(df_todas_opcoes)
+
+        registro.update(versao=versao, cubo=cubo, pernas=df_todas_opcoes, clientes_alterados=set())
+        return cubo
+
+def fatiar_cubo(cubo, filtros, agrupar_por):
+    """Filtra o cubo (dimensão -> valores; vazio = todos) e soma as medidas pelas dimensões pedidas."""
+    mascara = pd.Series(True, index=cubo.index)
+    for dimensao, valores in filtros.items():
+        if valores:
+            mascara &= cubo[dimensao].isin(valores)
+    return agregar_fatia_cubo(cubo[mascara], agrupar_por)
+
+def agregar_fatia_cubo(fatia, agrupar_por):
+    """Soma as medidas de células já filtradas do cubo pelas dimensões pedidas (nenhuma = total)."""
+    if not agrupar_por:
+        return fatia[MEDIDAS_CUBO].sum().to_frame().T
+    return fatia.groupby(list(agrupar_por), sort=True, dropna=False)[MEDIDAS_CUBO].sum().reset_index()
+
+# --- ÍNDICE DE FILTROS ---
+
+def construir_indice_filtros(df, colunas):
+    """Códigos categóricos por coluna, calculados uma vez por versão dos dados.
+
+    Os valores de cada coluna ficam ordenados e servem de opções dos filtros;
+    as máscaras saem dos códigos, sem comparar strings.
+    """
+    indice = {'tamanho': len(df), 'valores': {}, 'posicoes': {}, 'codigos': {}}
+    for coluna in colunas:
+        codigos, valores = pd.factorize(df[coluna], sort=True)
+        indice['codigos'][coluna] = codigos
+        indice['valores'][coluna] = list(valores)
+        indice['posicoes'][coluna] = {valor: posicao for posicao, valor in enumerate(valores)}
+    return indice
+
+def mascara_indice(indice, selecoes):
+    """Máscara booleana das linhas que atendem todas as seleções (coluna -> valores; vazio = todos)."""
+    mascara = np.ones(indice['tamanho'], dtype=bool)
+    for coluna, valores in selecoes.items():
+        if not valores:
+            continue
+        posicoes = indice['posicoes'][coluna]
+        # Uma posição extra no fim recebe o código -1 dos valores ausentes, que nunca são selecionados
+        selecionados = np.zeros(len(posicoes) + 1, dtype=bool)
+        selecionados[[posicoes[valor] for valor in valores if valor in posicoes]] = True
+        mascara &= selecionados[indice['codigos'][coluna]]
+    return mascara
+
+def posicoes_mascara(mascara):
+    """Posições das linhas marcadas, ou None quando todas estão (a fatia é o próprio DataFrame).
+
+    É o que os filtros memorizam: um vetor de inteiros em vez de uma cópia das linhas.
+    """
+    if mascara.all():
+        return None
+    return np.flatnonzero(mascara)
+
+def fatiar_por_posicoes(df, posicoes):
+    """Fatia no momento de exibir; sem posições devolve o próprio DataFrame, sem cópia."""
+    return df if posicoes is None else df.iloc[posicoes]
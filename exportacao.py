@@ -0,0 +1,128 @@
+"""Exportação de todas as carteiras para Excel ou CSV, linha a linha.
+
+Nenhuma planilha é montada em memória: o Excel usa o modo write-only do
+openpyxl e o CSV é escrito em fluxo dentro de um .zip, cliente a cliente.
+
+Uso pela linha de comando (usa o instantâneo recente do nucleo.resumos, se
+houver, ou lê a planilha com as credenciais de .streamlit/secrets.toml):
+
+    python exportacao.py --formato xlsx --saida carteiras.xlsx
+    python exportacao.py --formato csv --saida carteiras.zip
+"""
+import argparse
+import csv
+import io
+import os
+import tempfile
+import zipfile
+
+import pandas as pd
+
+COLUNAS_EXPORTACAO_INVESTIMENTOS = ['Código', 'Quantidade', 'Preço Médio', 'Valor Investido']
+COLUNAS_EXPORTACAO_OPCOES = ['Mês', 'Situação', 'Ativo', 'Opção', 'Tipo', 'Strike', 'Recomendação', 'Quantidade', 'Preço Executado']
+COLUNAS_EXPORTACAO_CONSOLIDADO = ['Cliente', 'Data de Vencimento'] + COLUNAS_EXPORTACAO_OPCOES
+
+FORMATOS_EXPORTACAO = {
+    'xlsx': {'extensao': 'xlsx', 'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'},
+    'csv': {'extensao': 'zip', 'mime': 'application/zip'},
+}
+
+def valor_celula(valor):
+    """Converte ausentes do pandas (NaN, NA, NaT) em célula vazia."""
+    if valor is None or pd.isna(valor): return None
+    return valor
+
+def linhas_por_cliente(dados_carteiras, tipo, colunas):
+    for nome, carteira in dados_carteiras.items():
+        df = carteira.get(tipo, pd.DataFrame())
+        if df.empty:
+            continue
+        df = df.reindex(columns=colunas)
+        for linha in df.itertuples(index=False, name=None):
+            yield [nome] + [valor_celula(v) for v in linha]
+
+def linhas_consolidado(df_todas_opcoes, tamanho_bloco=5000):
+    if df_todas_opcoes.empty:
+        return
+    for inicio in range(0, len(df_todas_opcoes), tamanho_bloco):
+        bloco = df_todas_opcoes.iloc[inicio:inicio + tamanho_bloco].reindex(columns=COLUNAS_EXPORTACAO_CONSOLIDADO)
+        for linha in bloco.itertuples(index=False, name=None):
+            yield [valor_celula(v) for v in linha]
+
+def abas_exportacao(dados_carteiras, df_todas_opcoes):
+    """(nome da aba, cabeçalho, gerador de linhas) para cada parte da exportação."""
+    return [
+        ('Investimentos', ['Cliente'] + COLUNAS_EXPORTACAO_INVESTIMENTOS,
+         linhas_por_cliente(dados_carteiras, 'investimentos', COLUNAS_EXPORTACAO_INVESTIMENTOS)),
+        ('Opções', ['Cliente'] + COLUNAS_EXPORTACAO_OPCOES,
+         linhas_por_cliente(dados_carteiras, 'opcoes', COLUNAS_EXPORTACAO_OPCOES)),
+        ('Todas as Opções', COLUNAS_EXPORTACAO_CONSOLIDADO, linhas_consolidado(df_todas_opcoes)),
+    ]
+
+def exportar_excel(destino, dados_carteiras, df_todas_opcoes):
+    """Grava um .xlsx com uma aba por parte; destino pode ser caminho ou arquivo binário."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for titulo, cabecalho, linhas in abas_exportacao(dados_carteiras, df_todas_opcoes):
+        aba = workbook.create_sheet(title=titulo)
+        aba.append(cabecalho)
+        for linha in linhas:
+            aba.append(linha)
+    workbook.save(destino)
+
+def exportar_csv(destino, dados_carteiras, df_todas_opcoes):
+    """Grava um .zip com um CSV (separador ';', UTF-8 com BOM) por parte; destino pode ser caminho ou arquivo binário."""
+    with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as arquivo_zip:
+        for titulo, cabecalho, linhas in abas_exportacao(dados_carteiras, df_todas_opcoes):
+            with arquivo_zip.open(f'{titulo}.csv', 'w') as saida_binaria:
+                with io.TextIOWrapper(saida_binaria, encoding='utf-8-sig', newline='') as saida:
+                    escritor = csv.writer(saida, delimiter=';')
+                    escritor.writerow(cabecalho)
+                    escritor.writerows(linhas)
+
+def exportar(destino, formato, dados_carteiras, df_todas_opcoes):
+    if formato == 'xlsx':
+        exportar_excel(destino, dados_carteiras, df_todas_opcoes)
+    elif formato == 'csv':
+        exportar_csv(destino, dados_carteiras, df_todas_opcoes)
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+
+def exportar_para_bytes(formato, dados_carteiras, df_todas_opcoes):
+    """Conteúdo do arquivo exportado, para o st.download_button.
+
+    A geração passa por um arquivo temporário em disco, fechado ao sair;
+    só o arquivo final, já comprimido, fica em memória.
+    """
+    with tempfile.TemporaryFile() as arquivo:
+        exportar(arquivo, formato, dados_carteiras, df_todas_opcoes)
+        arquivo.seek(0)
+        return arquivo.read()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta as carteiras de todos os clientes.")
+    parser.add_argument('--formato', choices=sorted(FORMATOS_EXPORTACAO), default='xlsx')
+    parser.add_argument('--saida', help="Arquivo de saída (padrão: carteiras.xlsx ou carteiras.zip)")
+    parser.add_argument('--segredos', default=os.path.join('.streamlit', 'secrets.toml'), help="Credenciais no formato do secrets.toml do Streamlit")
+    parser.add_argument('--instantaneo', default=None, help="Instantâneo gravado pelo nucleo.resumos, usado se for recente (padrão: resumos/instantaneo.pkl; '' para sempre ler a planilha)")
+    args = parser.parse_args(argv)
+
+    from nucleo.planilha import ler_segredos, conectar_planilha, carregar_conjunto, carregar_instantaneo_recente, CAMINHO_INSTANTANEO
+
+    try:
+        conjunto = carregar_instantaneo_recente(CAMINHO_INSTANTANEO if args.instantaneo is None else args.instantaneo)
+        if conjunto is None:
+            conjunto = carregar_conjunto(conectar_planilha(ler_segredos(args.segredos)))
+        df_clientes, dados_carteiras, df_todas_opcoes = conjunto
+    except Exception as e:
+        parser.exit(1, f"Não foi possível carregar os dados. Verifique a conexão e as permissões. Erro: {e}\n")
+    if df_clientes.empty:
+        parser.exit(1, "Nenhum dado de cliente para exportar.\n")
+
+    saida = args.saida or f"carteiras.{FORMATOS_EXPORTACAO[args.formato]['extensao']}"
+    exportar(saida, args.formato, dados_carteiras, df_todas_opcoes)
+    print(f"Exportação de {len(dados_carteiras)} clientes gravada em {saida}")
+
+if __name__ == '__main__':
+    main()
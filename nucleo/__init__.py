@@ -0,0 +1,7 @@
+"""Núcleo de dados sem Streamlit: leitura da planilha, conversões e regras de vencimento.
+
+O dashboard usa estes módulos através do dados.py, que acrescenta o cache
+partilhado e as mensagens na tela. Fora do navegador, ``nucleo.resumos``
+gera os resumos de vencimentos pela linha de comando e renova o instantâneo
+do conjunto que o dashboard carrega no lugar da planilha.
+"""
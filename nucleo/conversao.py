@@ -0,0 +1,75 @@
+"""Conversões dos valores lidos da planilha: moeda, tipo e vencimento das opções."""
+import pandas as pd
+from datetime import datetime, date, timedelta
+import re
+
+NUMERO_DO_MES = {
+    'Janeiro': 1, 'Fevereiro': 2, 'Março': 3, 'Abril': 4, 'Maio': 5, 'Junho': 6,
+    'Julho': 7, 'Agosto': 8, 'Setembro': 9, 'Outubro': 10, 'Novembro': 11, 'Dezembro': 12
+}
+
+def formatar_valor_brl(valor):
+    if pd.isna(valor) or valor == '': return "R$ 0,00"
+    try:
+        valor_float = float(valor)
+        return f"R$ {valor_float:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    except (ValueError, TypeError):
+        return valor
+
+def limpar_valor_monetario(valor):
+    if isinstance(valor, (int, float)): return valor
+    if isinstance(valor, str):
+        valor_limpo = valor.replace("R$", "").strip().replace(".", "").replace(",", ".")
+        try: return float(valor_limpo)
+        except (ValueError, TypeError): return 0.0
+    return 0.0
+
+def identificar_tipo_opcao(ticker):
+    if not isinstance(ticker, str) or len(ticker) < 5: return 'N/D'
+    quinta_letra = ticker[4].upper()
+    if 'A' <= quinta_letra <= 'L': return 'Call'
+    elif 'M' <= quinta_letra <= 'X': return 'Put'
+    else: return 'N/D'
+
+def calcular_data_vencimento(row):
+    """
+    Calcula a data de vencimento correta para opções MENSAIS e SEMANAIS.
+    - Mensais: 3ª sexta-feira do mês.
+    - Semanais (com W1, W2, W4, W5 no código): 1ª, 2ª, 4ª ou 5ª sexta-feira.
+    """
+    mes_str = row['Mês']
+    ticker = row['Opção']
+
+    if not isinstance(mes_str, str) or not isinstance(ticker, str):
+        return None
+    
+    num_mes = NUMERO_DO_MES.get(mes_str.capitalize())
+    if not num_mes: return None
+
+    ano = datetime.now().year
+    primeiro_dia_mes = date(ano, num_mes, 1)
+    
+    dias_para_sexta = (4 - primeiro_dia_mes.weekday() + 7) % 7
+    primeira_sexta = primeiro_dia_mes + timedelta(days=dias_para_sexta)
+    
+    match = re.search(r'W([1245])', ticker.upper())
+    
+    if match:
+        semana = int(match.group(1))
+        vencimento = None
+        if semana == 1: vencimento = primeira_sexta
+        elif semana == 2: vencimento = primeira_sexta + timedelta(days=7)
+        elif semana == 4: vencimento = primeira_sexta + timedelta(days=21)
+        elif semana == 5: vencimento = primeira_sexta + timedelta(days=28)
+        
+        if vencimento and vencimento.month == num_mes:
+            return vencimento
+        else:
+            return None
+    else:
+        terceira_sexta = primeira_sexta + timedelta(days=14)
+        return terceira_sexta
+
+def ordenar_meses(meses):
+    """Nomes de meses em ordem de calendário; valores que não são meses vão para o fim."""
+    return sorted(meses, key=lambda mes: (NUMERO_DO_MES.get(str(mes).capitalize(), 13), str(mes)))
@@ -0,0 +1,176 @@
+"""Conexão com a Planilha Google e leitura de todas as carteiras, sem depender do Streamlit.
+
+As credenciais vêm de um dicionário no formato do ``st.secrets``: o dashboard
+passa o próprio ``st.secrets`` e a linha de comando lê ``.streamlit/secrets.toml``.
+O conjunto lido pode ser guardado num instantâneo (gravado pelo ``nucleo.resumos``),
+que os leitores usam no lugar da planilha enquanto for recente.
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from nucleo.conversao import limpar_valor_monetario, identificar_tipo_opcao, calcular_data_vencimento
+
+logger = logging.getLogger(__name__)
+
+CAMINHO_INSTANTANEO = os.path.join('resumos', 'instantaneo.pkl')
+IDADE_MAXIMA_INSTANTANEO = timedelta(minutes=5)
+
+MESES_PT = ['JANEIRO', 'FEVEREIRO', 'MARÇO', 'ABRIL', 'MAIO', 'JUNHO', 'JULHO', 'AGOSTO', 'SETEMBRO', 'OUTUBRO', 'NOVEMBRO', 'DEZEMBRO']
+
+def ler_segredos(caminho):
+    """Lê um secrets.toml do Streamlit para fora de uma sessão."""
+    import tomllib
+
+    with open(caminho, 'rb') as arquivo:
+        return tomllib.load(arquivo)
+
+def conectar_planilha(segredos):
+    # Importação adiada: só quem fala com a planilha paga o custo do gspread e do google-auth
+    import gspread
+    from google.oauth2.service_account import Credentials
+
+    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
+    creds = Credentials.from_service_account_info(
+        segredos["gcp_service_account"], scopes=scopes
+    )
+    client = gspread.authorize(creds)
+    return client.open_by_url(segredos["private_gsheets_url"])
+
+def carregar_conjunto(spreadsheet, avisar=logger.warning):
+    """Lê a planilha inteira e devolve (df_clientes, carteiras, df_todas_opcoes).
+
+    Abas de cliente em falta são comunicadas por ``avisar`` e ficam com
+    carteiras vazias; a falta da aba 'Clientes' levanta ValueError.
+    """
+    worksheets = spreadsheet.worksheets()
+    all_sheets_data = {sheet.title: sheet.get_all_values() for sheet in worksheets}
+
+    sheet_clientes_data = all_sheets_data.get("Clientes", [])
+    if not sheet_clientes_data:
+        raise ValueError("Aba 'Clientes' não encontrada na Planilha Google.")
+    
+    df_clientes = pd.DataFrame(sheet_clientes_data[1:], columns=sheet_clientes_data[0])
+    df_clientes['Início do Acompanhamento'] = pd.to_datetime(df_clientes['Início do Acompanhamento'], errors='coerce', dayfirst=True)
+    
+    # Lida com a nova coluna de vencimento
+    if 'Vencimento do Contrato' in df_clientes.columns:
+        df_clientes['Vencimento do Contrato'] = pd.to_datetime(df_clientes['Vencimento do Contrato'], errors='coerce', dayfirst=True)
+    else:
+        # Se a coluna não existir, cria uma vazia para evitar erros
+        df_clientes['Vencimento do Contrato'] = pd.NaT
+
+    nomes_clientes = df_clientes['Nome'].tolist()
+    dados_completos_clientes = {}
+    lista_opcoes_geral = []
+
+    for nome in nomes_clientes:
+        if nome in all_sheets_data:
+            data = all_sheets_data[nome]
+            df_cliente_raw = pd.DataFrame(data).fillna('')
+            
+            try:
+                start_row_inv = df_cliente_raw[df_cliente_raw[0] == 'CÓDIGO'].index[0]
+                data_inv = df_cliente_raw.iloc[start_row_inv + 1:, :4]
+                df_investimentos = pd.DataFrame(data_inv.values)
+                df_investimentos.columns = ['Código', 'Quantidade', 'Preço Médio', 'Valor Investido']
+                df_investimentos = df_investimentos[df_investimentos['Código'] != ''].dropna(how='all')
+                df_investimentos['Quantidade'] = pd.to_numeric(df_investimentos['Quantidade'], errors='coerce').round().astype('Int64')
+                df_investimentos['Valor Investido'] = df_investimentos['Valor Investido'].apply(limpar_valor_monetario)
+                df_investimentos['Preço Médio'] = df_investimentos['Preço Médio'].apply(limpar_valor_monetario)
+            except (IndexError, ValueError):
+                df_investimentos = pd.DataFrame()
+
+            lista_df_opcoes = []
+            month_rows_indices = df_cliente_raw[df_cliente_raw.apply(lambda r: any(str(c).upper() in MESES_PT for c in r), axis=1)].index.tolist()
+            
+            for i, start_block_idx in enumerate(month_rows_indices):
+                end_block_idx = month_rows_indices[i + 1] if i + 1 < len(month_rows_indices) else len(df_cliente_raw)
+                mes_atual = next((str(c).capitalize() for c in df_cliente_raw.loc[start_block_idx] if str(c).upper() in MESES_PT), None)
+                df_search_area = df_cliente_raw.loc[start_block_idx:end_block_idx-1]
+                header_row_series = df_search_area[df_search_area.apply(lambda r: 'SITUAÇÃO' in r.astype(str).values, axis=1)]
+                
+                if not header_row_series.empty:
+                    header_idx = header_row_series.index[0]
+                    start_col_op = df_cliente_raw.loc[header_idx][df_cliente_raw.loc[header_idx].astype(str) == 'SITUAÇÃO'].index[0]
+                    data_rows = df_cliente_raw.loc[header_idx + 1: end_block_idx - 1]
+                    df_temp = data_rows.iloc[:, start_col_op:start_col_op + 7]
+                    df_temp.columns = ['Situação', 'Ativo', 'Opção', 'Strike', 'Recomendação', 'Quantidade', 'Preço Executado']
+                    df_temp = df_temp[df_temp['Situação'] != ''].dropna(how='all')
+                    if not df_temp.empty:
+                        df_temp['Mês'] = mes_atual
+                        lista_df_opcoes.append(df_temp)
+
+            df_opcoes_final = pd.DataFrame()
+            if lista_df_opcoes:
+                df_opcoes_final = pd.concat(lista_df_opcoes, ignore_index=True)
+                df_opcoes_final['Quantidade'] = pd.to_numeric(df_opcoes_final['Quantidade'], errors='coerce').round().astype('Int64')
+                df_opcoes_final['Strike'] = df_opcoes_final['Strike'].apply(limpar_valor_monetario)
+                df_opcoes_final['Preço Executado'] = df_opcoes_final['Preço Executado'].apply(limpar_valor_monetario)
+                df_opcoes_final['Tipo'] = df_opcoes_final['Opção'].apply(identificar_tipo_opcao)
+                
+                df_opcoes_cliente = df_opcoes_final.copy()
+                df_opcoes_cliente['Cliente'] = nome
+                lista_opcoes_geral.append(df_opcoes_cliente)
+
+            dados_completos_clientes[nome] = {'investimentos': df_investimentos, 'opcoes': df_opcoes_final}
+        else:
+            avisar(f"Aba para o cliente '{nome}' não encontrada.")
+            dados_completos_clientes[nome] = {'investimentos': pd.DataFrame(), 'opcoes': pd.DataFrame()}
+    
+    df_todas_opcoes = pd.DataFrame()
+    if lista_opcoes_geral:
+        df_todas_opcoes = pd.concat(lista_opcoes_geral, ignore_index=True)
+        df_todas_opcoes['Data de Vencimento'] = df_todas_opcoes.apply(calcular_data_vencimento, axis=1)
+        df_todas_opcoes.dropna(subset=['Data de Vencimento'], inplace=True)
+        df_todas_opcoes['Data de Vencimento'] = pd.to_datetime(df_todas_opcoes['Data de Vencimento'])
+
+    return df_clientes, dados_completos_clientes, df_todas_opcoes
+
+# --- INSTANTÂNEO DO CONJUNTO ---
+
+def gravar_instantaneo(caminho, df_clientes, carteiras, df_todas_opcoes, lido_em):
+    """Grava o conjunto lido da planilha num pickle, com a hora em que a leitura começou.
+
+    Escreve num arquivo temporário e troca no fim, para quem lê o instantâneo
+    nunca encontrar um arquivo pela metade.
+    """
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    temporario = f"{caminho}.tmp"
+    pd.to_pickle({
+        'lido_em': lido_em,
+        'df_clientes': df_clientes,
+        'carteiras': carteiras,
+        'df_todas_opcoes': df_todas_opcoes,
+    }, temporario)
+    os.replace(temporario, caminho)
+    return caminho
+
+def ler_instantaneo(caminho):
+    """Devolve (df_clientes, carteiras, df_todas_opcoes, lido_em) de um instantâneo gravado."""
+    instantaneo = pd.read_pickle(caminho)
+    return instantaneo['df_clientes'], instantaneo['carteiras'], instantaneo['df_todas_opcoes'], instantaneo['lido_em']
+
+def carregar_instantaneo_recente(caminho=CAMINHO_INSTANTANEO, idade_maxima=IDADE_MAXIMA_INSTANTANEO, posterior_a=None):
+    """(df_clientes, carteiras, df_todas_opcoes) do instantâneo, ou None se for preciso ler a planilha.
+
+    Só serve um instantâneo lido da planilha há menos de ``idade_maxima`` e,
+    se ``posterior_a`` for dado, depois dessa hora (a última gravação feita
+    por quem chama, que o instantâneo ainda não teria). A data de modificação
+    do arquivo descarta os antigos sem abri-los.
+    """
+    if not caminho or not os.path.exists(caminho):
+        return None
+    agora = datetime.now()
+    if agora - datetime.fromtimestamp(os.path.getmtime(caminho)) > idade_maxima:
+        return None
+    try:
+        df_clientes, carteiras, df_todas_opcoes, lido_em = ler_instantaneo(caminho)
+    except Exception as e:
+        logger.warning("Instantâneo ilegível em %s, a planilha será lida: %s", caminho, e)
+        return None
+    if agora - lido_em > idade_maxima or (posterior_a is not None and lido_em <= posterior_a):
+        return None
+    return df_clientes, carteiras, df_todas_opcoes
@@ -0,0 +1,62 @@
+"""Regras de renovação de contratos e de alerta de vencimento das opções.
+
+Usadas pelas páginas Visão Geral e Calendário e pelos resumos da linha de
+comando; ``hoje`` pode ser ``date`` ou ``Timestamp``.
+"""
+import pandas as pd
+
+def criar_url_wpp(celular):
+    if pd.notna(celular) and str(celular).strip():
+        celular_limpo = ''.join(filter(str.isdigit, str(celular)))
+        return f"https://wa.me/{celular_limpo}"
+    return None
+
+def definir_cor(dias):
+    if dias <= 7: return "#c0392b"  # Vermelho
+    if dias <= 15: return "#f1c40f" # Amarelo
+    return "#075025" # Verde Escuro
+
+def calcular_vencimento_display(row, hoje):
+    """Próximo vencimento do contrato: o cadastrado, renovado se já passou, ou um ano após o início."""
+    hoje_ts = pd.Timestamp(hoje)
+    vencimento_contrato = row['Vencimento do Contrato']
+    inicio_acompanhamento = row['Início do Acompanhamento']
+
+    if pd.notna(vencimento_contrato):
+        if vencimento_contrato < hoje_ts:
+            anos_passados = hoje_ts.year - vencimento_contrato.year
+            return vencimento_contrato + pd.DateOffset(years=anos_passados + 1)
+        return vencimento_contrato
+    elif pd.notna(inicio_acompanhamento):
+        return inicio_acompanhamento + pd.DateOffset(years=1)
+    return pd.NaT
+
+def gerar_acao_vencimento(row, hoje):
+    """Link de WhatsApp para clientes cujo contrato vence no mês corrente."""
+    vencimento = row['Vencimento do Contrato']
+    if pd.notna(vencimento) and vencimento.month == hoje.month and vencimento.year == hoje.year:
+        return criar_url_wpp(row['Celular'])
+    return None
+
+def preparar_contratos(df_clientes, hoje):
+    """Clientes com o próximo vencimento do contrato e a ação de renovação."""
+    df_contratos = df_clientes.copy()
+    df_contratos['Vencimento do Contrato'] = pd.to_datetime(df_contratos.apply(calcular_vencimento_display, axis=1, args=(hoje,)))
+    df_contratos['Ação'] = df_contratos.apply(gerar_acao_vencimento, axis=1, args=(hoje,))
+    return df_contratos
+
+def preparar_vencimentos_opcoes(df_todas_opcoes, df_clientes, hoje):
+    """Pernas que ainda vão vencer, ordenadas pela data, com dias restantes, cor do alerta e contato do cliente."""
+    hoje = pd.Timestamp(hoje).normalize()
+    df_futuras = df_todas_opcoes[df_todas_opcoes['Data de Vencimento'] >= hoje].copy()
+    if df_futuras.empty:
+        return df_futuras
+
+    df_futuras['Dias para Vencer'] = (df_futuras['Data de Vencimento'] - hoje).dt.days
+    df_futuras['Cor'] = df_futuras['Dias para Vencer'].apply(definir_cor)
+    # Converte para date uma única vez; o índice de filtros e o detalhe do dia reutilizam esta coluna
+    df_futuras['Data'] = df_futuras['Data de Vencimento'].dt.date
+
+    df_futuras = pd.merge(df_futuras, df_clientes[['Nome', 'Celular']], left_on='Cliente', right_on='Nome', how='left')
+    df_futuras['Ação'] = df_futuras['Celular'].apply(criar_url_wpp)
+    return df_futuras.sort_values(by="Data de Vencimento", kind="stable")
@@ -0,0 +1,88 @@
+"""Resumos de vencimentos de opções e de renovações de contratos de todos os clientes.
+
+Feito para rodar agendado (cron), sem abrir o dashboard: relê a planilha,
+guarda o conjunto lido como instantâneo (``instantaneo.pkl``), calcula os
+vencimentos de todos os clientes de uma vez e grava um CSV por resumo
+(separador ';', UTF-8 com BOM) na pasta de saída.
+
+Com a pasta padrão, o dashboard e o exportacao.py carregam esse instantâneo
+em vez de reler a planilha enquanto ele for recente (ver
+``nucleo.planilha.carregar_instantaneo_recente``); agende o CLI com um
+intervalo menor que IDADE_MAXIMA_INSTANTANEO para que isso aconteça.
+
+    python -m nucleo.resumos --segredos .streamlit/secrets.toml --saida resumos --dias 30
+"""
+import argparse
+import logging
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from nucleo.planilha import ler_segredos, conectar_planilha, carregar_conjunto, gravar_instantaneo
+from nucleo.regras import criar_url_wpp, preparar_contratos, preparar_vencimentos_opcoes
+
+COLUNAS_RESUMO_OPCOES = ['Data de Vencimento', 'Dias para Vencer', 'Cliente', 'Celular', 'Ativo', 'Opção', 'Tipo', 'Strike', 'Quantidade', 'Situação', 'Ação']
+COLUNAS_RESUMO_RENOVACOES = ['Vencimento do Contrato', 'Dias para Renovar', 'Nome', 'Celular', 'Email', 'Plano', 'Ação']
+
+def resumo_vencimentos_opcoes(df_todas_opcoes, df_clientes, hoje, dias):
+    """Pernas que vencem entre hoje e os próximos ``dias`` dias, da mais próxima para a mais distante."""
+    if df_todas_opcoes.empty:
+        return pd.DataFrame(columns=COLUNAS_RESUMO_OPCOES)
+    df_futuras = preparar_vencimentos_opcoes(df_todas_opcoes, df_clientes, hoje)
+    if df_futuras.empty:
+        return pd.DataFrame(columns=COLUNAS_RESUMO_OPCOES)
+    return df_futuras[df_futuras['Dias para Vencer'] <= dias].reindex(columns=COLUNAS_RESUMO_OPCOES)
+
+def resumo_renovacoes(df_clientes, hoje, dias):
+    """Contratos que renovam entre hoje e os próximos ``dias`` dias, com link de contato."""
+    if df_clientes.empty:
+        return pd.DataFrame(columns=COLUNAS_RESUMO_RENOVACOES)
+    df_contratos = preparar_contratos(df_clientes, hoje)
+    df_contratos['Dias para Renovar'] = (df_contratos['Vencimento do Contrato'] - pd.Timestamp(hoje).normalize()).dt.days
+    df_contratos['Ação'] = df_contratos['Celular'].apply(criar_url_wpp)
+    df_contratos = df_contratos[df_contratos['Dias para Renovar'].between(0, dias)]
+    return df_contratos.sort_values(by='Vencimento do Contrato', kind='stable').reindex(columns=COLUNAS_RESUMO_RENOVACOES)
+
+def gerar_resumos(df_clientes, df_todas_opcoes, hoje, dias):
+    """Nome do resumo -> DataFrame, calculados numa única passagem sobre todos os clientes."""
+    return {
+        'vencimentos_opcoes': resumo_vencimentos_opcoes(df_todas_opcoes, df_clientes, hoje, dias),
+        'renovacoes_contratos': resumo_renovacoes(df_clientes, hoje, dias),
+    }
+
+def gravar_resumos(pasta, resumos, hoje):
+    """Grava cada resumo como ``<nome>_<AAAA-MM-DD>.csv`` na pasta e devolve os caminhos."""
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for nome, df in resumos.items():
+        caminho = os.path.join(pasta, f"{nome}_{hoje:%Y-%m-%d}.csv")
+        df.to_csv(caminho, sep=';', index=False, encoding='utf-8-sig', date_format='%d/%m/%Y')
+        caminhos.append(caminho)
+    return caminhos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os resumos de vencimentos de opções e de renovações de contratos.")
+    parser.add_argument('--segredos', default=os.path.join('.streamlit', 'secrets.toml'), help="Credenciais no formato do secrets.toml do Streamlit")
+    parser.add_argument('--saida', default='resumos', help="Pasta onde os resumos são gravados (padrão: resumos)")
+    parser.add_argument('--dias', type=int, default=30, help="Janela a partir de hoje, em dias (padrão: 30)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    try:
+        # Hora anterior à leitura: o que for gravado durante ela não está no instantâneo
+        lido_em = datetime.now()
+        df_clientes, carteiras, df_todas_opcoes = carregar_conjunto(conectar_planilha(ler_segredos(args.segredos)))
+    except Exception as e:
+        parser.exit(1, f"Não foi possível carregar os dados. Verifique a conexão e as permissões. Erro: {e}\n")
+
+    caminho_instantaneo = gravar_instantaneo(os.path.join(args.saida, 'instantaneo.pkl'), df_clientes, carteiras, df_todas_opcoes, lido_em)
+    print(f"{len(carteiras)} carteiras em {caminho_instantaneo}")
+
+    hoje = date.today()
+    resumos = gerar_resumos(df_clientes, df_todas_opcoes, hoje, args.dias)
+    for caminho, df in zip(gravar_resumos(args.saida, resumos, hoje), resumos.values()):
+        print(f"{len(df)} linhas em {caminho}")
+
+if __name__ == '__main__':
+    main()
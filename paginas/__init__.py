@@ -0,0 +1,9 @@
+"""Páginas do dashboard, importadas sob demanda pelo dashboard.py.
+
+Cada módulo expõe ``exibir(...)`` e importa as suas dependências pesadas
+(Plotly, componente de calendário) apenas quando a página é aberta.
+
+Os dados derivados são memorizados com ``st.cache_resource`` e ficam
+partilhados entre execuções, por isso não devem ser modificados. Parâmetros
+com prefixo "_" não entram na chave do cache: a versão identifica os dados.
+"""
@@ -0,0 +1,180 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from streamlit_calendar import calendar
+
+from dados import construir_indice_filtros, mascara_indice, posicoes_mascara, fatiar_por_posicoes
+from nucleo.regras import preparar_vencimentos_opcoes
+
+# --- DADOS DERIVADOS ---
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def preparar_vencimentos(versao, _df_todas_opcoes, _df_clientes, hoje):
+    """Vencimentos futuros com cor, data, contato e eventos do calendário, calculados uma vez por versão e dia."""
+    df_futuras = preparar_vencimentos_opcoes(_df_todas_opcoes, _df_clientes, hoje)
+    if df_futuras.empty:
+        return None
+
+    calendar_events = []
+    # Agrupa para mostrar apenas um ponto por dia
+    for venc_date, group in df_futuras.groupby('Data de Vencimento'):
+        event = {
+            "title": "●", # Título como um ponto para garantir visibilidade
+            "color": group['Cor'].iloc[0], # Pega a cor do alerta mais próximo
+            "start": venc_date.strftime("%Y-%m-%d"),
+            "end": venc_date.strftime("%Y-%m-%d"),
+            "allDay": True,
+            "display": "background", # Pinta o fundo do dia
+        }
+        calendar_events.append(event)
+
+    indice = construir_indice_filtros(df_futuras, ['Cliente', 'Opção', 'Data'])
+
+    return {
+        'df': df_futuras,
+        'indice': indice,
+        'eventos': calendar_events,
+        'clientes': indice['valores']['Cliente'],
+        'opcoes': indice['valores']['Opção'],
+        'datas': indice['valores']['Data'],
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def posicoes_vencimentos(versao, hoje, _dados_vencimento, clientes, opcoes, datas, dia=None):
+    # Seleção vazia significa "todos"; o dia clicado é mais uma máscara no mesmo AND
+    mascara = mascara_indice(_dados_vencimento['indice'], {'Cliente': clientes, 'Opção': opcoes, 'Data': datas})
+    if dia is not None:
+        mascara &= mascara_indice(_dados_vencimento['indice'], {'Data': (dia,)})
+    return posicoes_mascara(mascara)
+
+def filtrar_vencimentos(versao, hoje, dados_vencimento, clientes, opcoes, datas, dia=None):
+    # O cache partilhado guarda só as posições; a fatia é montada a cada exibição
+    posicoes = posicoes_vencimentos(versao, hoje, dados_vencimento, clientes, opcoes, datas, dia)
+    return fatiar_por_posicoes(dados_vencimento['df'], posicoes)
+
+# --- FRAGMENTOS ---
+
+@st.fragment
+def exibir_calendario(dados_vencimento, versao, hoje):
+    # --- NOVO LAYOUT DE COLUNAS ---
+    col_cal, col_list = st.columns([1, 2])
+
+    with col_cal:
+        st.subheader("Navegação")
+
+        # --- CONFIGURAÇÕES DO CALENDÁRIO ---
+        calendar_options = {
+            "headerToolbar": {
+                "left": "today prev,next", "center": "title", "right": "",
+            },
+            "initialView": "dayGridMonth", "locale": "pt-br",
+            "navLinks": False, "selectable": True,
+        }
+
+        # Renderiza o calendário; só o clique no dia devolve estado (evita reexecuções por "eventsSet")
+        state = calendar(
+            events=dados_vencimento['eventos'], options=calendar_options,
+            callbacks=["dateClick"], key="calendar_vencimentos"
+        )
+
+        # --- LÓGICA DE ATUALIZAÇÃO DO ESTADO ---
+        # O componente devolve sempre o último clique; só aplica cliques ainda não processados
+        if state.get("dateClick") and state["dateClick"] != st.session_state.get("ultimo_clique_calendario"):
+            st.session_state.ultimo_clique_calendario = state["dateClick"]
+            data_clicada_str = state["dateClick"]["date"].split("T")[0]
+            st.session_state.selected_date = datetime.strptime(data_clicada_str, "%Y-%m-%d").date()
+
+    with col_list:
+        # --- FILTROS EXPANSÍVEIS ---
+        # Começam vazios ("Todos"): pré-selecionar milhares de opções custa mais que o próprio filtro
+        with st.expander("🔍 Mostrar/Ocultar Filtros"):
+            c1, c2, c3 = st.columns(3)
+            with c1:
+                clientes_disponiveis = dados_vencimento['clientes']
+                clientes_selecionados = st.multiselect("Cliente:", options=clientes_disponiveis, placeholder="Todos")
+            with c2:
+                opcoes_disponiveis = dados_vencimento['opcoes']
+                opcoes_selecionadas = st.multiselect("Opção:", options=opcoes_disponiveis, placeholder="Todos")
+            with c3:
+                datas_disponiveis = dados_vencimento['datas']
+                datas_selecionadas = st.multiselect("Data:", options=datas_disponiveis, placeholder="Todos")
+
+        # Aplica filtros
+        selecao = (tuple(clientes_selecionados), tuple(opcoes_selecionadas), tuple(datas_selecionadas))
+        df_filtrada = filtrar_vencimentos(versao, hoje, dados_vencimento, *selecao)
+
+        if df_filtrada.empty:
+            st.warning("Nenhuma operação encontrada com os filtros selecionados.")
+
+        # Se uma data foi clicada, mostra os detalhes daquele dia
+        elif 'selected_date' in st.session_state and st.session_state.selected_date:
+            data_selecionada = st.session_state.selected_date
+
+            col_btn1, col_btn2 = st.columns([2, 1])
+            with col_btn2:
+                if st.button("⬅️ Ver todos os vencimentos"):
+                    st.session_state.selected_date = None
+                    st.rerun(scope="fragment")
+
+            vencimentos_do_dia = filtrar_vencimentos(versao, hoje, dados_vencimento, *selecao, dia=data_selecionada)
+
+            if not vencimentos_do_dia.empty:
+                with col_btn1:
+                    st.subheader(f"Vencimentos para {data_selecionada.strftime('%d/%m/%Y')}")
+
+                for nome_cliente, df_cliente in vencimentos_do_dia.groupby('Cliente'):
+                    url_wpp = df_cliente['Ação'].iloc[0]
+
+                    c1, c2 = st.columns([3, 1])
+                    with c1:
+                        st.markdown(f"**Cliente:** {nome_cliente}")
+                    with c2:
+                        if url_wpp:
+                            st.link_button("Contatar", url=url_wpp)
+
+                    st.dataframe(
+                        df_cliente[['Opção', 'Ativo', 'Strike', 'Quantidade', 'Tipo']],
+                        hide_index=True, use_container_width=True,
+                        column_config={"Strike": st.column_config.NumberColumn("Strike", format="R$ %.2f")}
+                    )
+                    st.divider()
+            else:
+                st.info(f"Nenhum vencimento para {data_selecionada.strftime('%d/%m/%Y')} com os filtros atuais.")
+
+        # Se nenhuma data foi clicada, mostra a lista geral
+        else:
+            st.subheader("Próximos Vencimentos")
+            df_display = df_filtrada.rename(columns={
+                'Data de Vencimento': 'Vencimento',
+            })
+
+            colunas_tabela = ['Vencimento', 'Cliente', 'Ativo', 'Opção', 'Strike', 'Quantidade', 'Tipo', 'Ação']
+            st.dataframe(
+                df_display[colunas_tabela],
+                column_config={
+                    "Vencimento": st.column_config.DateColumn("Vencimento", format="DD/MM/YYYY"),
+                    "Strike": st.column_config.NumberColumn("Strike", format="R$ %.2f"),
+                    "Ação": st.column_config.LinkColumn("Ação", display_text="Contatar")
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+
+# --- PÁGINA ---
+
+def exibir(df_clientes, df_todas_opcoes, versao_dados):
+    st.header("Calendário Interativo de Vencimentos")
+
+    if df_todas_opcoes.empty:
+        st.info("Não há operações com opções cadastradas para exibir no calendário.")
+        st.stop()
+
+    # Filtra apenas vencimentos futuros
+    hoje = pd.to_datetime('today').normalize()
+    dados_vencimento = preparar_vencimentos(versao_dados, df_todas_opcoes, df_clientes, hoje)
+
+    if dados_vencimento is None:
+        st.info("Não há vencimentos futuros para exibir.")
+        st.stop()
+
+    exibir_calendario(dados_vencimento, versao_dados, hoje)
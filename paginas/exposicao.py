@@ -0,0 +1,74 @@
+import streamlit as st
+
+from dados import DIMENSOES_CUBO, cubo_exposicao_da_versao, agregar_fatia_cubo, construir_indice_filtros, mascara_indice, posicoes_mascara, fatiar_por_posicoes, formatar_valor_brl
+
+# --- DADOS DERIVADOS ---
+
+@st.cache_resource(show_spinner="A montar o cubo de exposição...", max_entries=4)
+def preparar_cubo(versao, _df_todas_opcoes):
+    cubo = cubo_exposicao_da_versao(versao, _df_todas_opcoes)
+    indice = construir_indice_filtros(cubo, DIMENSOES_CUBO)
+    return {'cubo': cubo, 'indice': indice, 'valores': indice['valores']}
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def posicoes_cubo(versao, _dados_cubo, filtros):
+    return posicoes_mascara(mascara_indice(_dados_cubo['indice'], dict(filtros)))
+
+def fatiar_cubo_memorizado(versao, dados_cubo, filtros, agrupar_por):
+    # Só as posições das células ficam no cache partilhado; a agregação da fatia é feita na exibição
+    fatia = fatiar_por_posicoes(dados_cubo['cubo'], posicoes_cubo(versao, dados_cubo, filtros))
+    return agregar_fatia_cubo(fatia, agrupar_por)
+
+# --- FRAGMENTOS ---
+
+@st.fragment
+def exibir_cubo(dados_cubo, versao):
+    valores = dados_cubo['valores']
+
+    with st.expander("🔍 Filtrar Exposição", expanded=True):
+        colunas = st.columns(len(DIMENSOES_CUBO))
+        filtros = []
+        for coluna, dimensao in zip(colunas, DIMENSOES_CUBO):
+            with coluna:
+                selecao = st.multiselect(
+                    f"{dimensao}:", options=valores[dimensao], placeholder="Todos",
+                    format_func=(lambda d: d.strftime('%d/%m/%Y')) if dimensao == 'Data de Vencimento' else str,
+                    key=f"cubo_{dimensao}"
+                )
+                filtros.append((dimensao, tuple(selecao)))
+
+    agrupar_por = st.multiselect(
+        "Agrupar por:", options=DIMENSOES_CUBO, default=['Ativo', 'Tipo', 'Data de Vencimento'], key="cubo_agrupar_por"
+    )
+
+    fatia = fatiar_cubo_memorizado(versao, dados_cubo, tuple(filtros), tuple(agrupar_por))
+    totais = fatia[['Quantidade', 'Notional', 'Prêmio', 'Pernas']].sum()
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Quantidade", f"{int(totais['Quantidade']):,}".replace(",", "."))
+    col2.metric("Notional (Strike × Qtd.)", formatar_valor_brl(totais['Notional']))
+    col3.metric("Prêmio (Preço × Qtd.)", formatar_valor_brl(totais['Prêmio']))
+    col4.metric("Pernas", int(totais['Pernas']))
+
+    st.dataframe(
+        fatia,
+        column_config={
+            "Data de Vencimento": st.column_config.DateColumn("Vencimento", format="DD/MM/YYYY"),
+            "Notional": st.column_config.NumberColumn("Notional", format="R$ %.2f"),
+            "Prêmio": st.column_config.NumberColumn("Prêmio", format="R$ %.2f"),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+# --- PÁGINA ---
+
+def exibir(df_todas_opcoes, versao_dados):
+    st.header("Exposição em Opções")
+
+    if df_todas_opcoes.empty:
+        st.info("Não há operações com opções cadastradas para analisar.")
+        st.stop()
+
+    dados_cubo = preparar_cubo(versao_dados, df_todas_opcoes)
+    exibir_cubo(dados_cubo, versao_dados)
@@ -0,0 +1,94 @@
+import streamlit as st
+import pandas as pd
+
+from dados import formatar_valor_brl, codigos_duplicados, carteira_por_codigo, reconciliar_carteira, atualizar_carteira_investimentos, invalidar_dados
+
+# --- DADOS DERIVADOS ---
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def filtrar_investimentos(versao, cliente, _df_invest, filtro_codigo):
+    if not filtro_codigo:
+        return _df_invest
+    return _df_invest[_df_invest['Código'].str.contains(filtro_codigo, case=False, na=False)]
+
+# --- FRAGMENTOS ---
+
+@st.fragment
+def exibir_editor_investimentos(cliente_selecionado, df_invest, versao):
+    # --- INÍCIO: NOVOS FILTROS PARA CARTEIRA DE INVESTIMENTOS ---
+    with st.expander("🔍 Filtrar Ativos"):
+        filtro_codigo = st.text_input("Buscar por Código do Ativo", key=f"filtro_codigo_{cliente_selecionado}")
+
+    df_invest_filtrado = filtrar_investimentos(versao, cliente_selecionado, df_invest, filtro_codigo)
+    # --- FIM: NOVOS FILTROS ---
+
+    with st.form(key="edicao_carteira_inline"):
+        carteira_para_editar = st.data_editor(
+            df_invest_filtrado, # Mostra o DataFrame filtrado
+            num_rows="dynamic",
+            use_container_width=True,
+            key=f"editor_{cliente_selecionado}",
+            column_config={
+                "Preço Médio": st.column_config.NumberColumn("Preço Médio", format="R$ %.2f"),
+                "Valor Investido": st.column_config.NumberColumn("Valor Investido", format="R$ %.2f")
+            }
+        )
+
+        submitted = st.form_submit_button("Salvar Alterações")
+        if submitted:
+            with st.spinner("A atualizar carteira..."):
+                # --- INÍCIO: RECONCILIAÇÃO PELO CÓDIGO DO ATIVO ---
+                # O código identifica a linha na planilha; repetido, não há como saber qual linha gravar
+                duplicados = sorted(set(codigos_duplicados(df_invest)) | set(codigos_duplicados(carteira_para_editar)))
+                if duplicados:
+                    st.error(f"Não é possível salvar: o código {', '.join(duplicados)} aparece em mais de uma linha. Junte ou corrija essas linhas antes de salvar.")
+                    return
+
+                # Compara só com as linhas mostradas: ativos escondidos pelo filtro ficam intactos
+                alteracoes = reconciliar_carteira(df_invest_filtrado, carteira_para_editar)
+                # ...mas uma linha nova com o código de um ativo escondido gravaria por cima dele
+                existentes = sorted(alteracoes['inseridas'].index.intersection(carteira_por_codigo(df_invest).index))
+                if existentes:
+                    st.error(f"Não é possível salvar: o código {', '.join(existentes)} já está na carteira, escondido pelo filtro. Limpe o filtro e edite a linha existente.")
+                    return
+                # --- FIM: RECONCILIAÇÃO ---
+
+                total_alteracoes = len(alteracoes['inseridas']) + len(alteracoes['atualizadas']) + len(alteracoes['removidas'])
+                if total_alteracoes == 0:
+                    st.info("Nenhuma alteração para salvar.")
+                    return
+
+                sucesso = atualizar_carteira_investimentos(cliente_selecionado, alteracoes)
+                if sucesso:
+                    st.success("Carteira atualizada com sucesso!")
+                    invalidar_dados()
+                    st.rerun()
+                else:
+                    st.error("Falha ao atualizar a carteira.")
+
+# --- PÁGINA ---
+
+def exibir(df_clientes, dados_carteiras, versao_dados):
+    st.header("Análise da Carteira de Investimentos")
+    cliente_selecionado = st.sidebar.selectbox("Selecione um Cliente", options=df_clientes['Nome'].unique())
+    st.sidebar.caption("Clique na caixa e digite para pesquisar.")
+    if cliente_selecionado:
+        df_invest = dados_carteiras.get(cliente_selecionado, {}).get('investimentos', pd.DataFrame())
+        
+        patrimonio_cliente = df_invest['Valor Investido'].sum() if not df_invest.empty else 0
+        num_ativos = len(df_invest)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Patrimônio Total do Cliente", formatar_valor_brl(patrimonio_cliente))
+        col2.metric("Número de Ativos", num_ativos)
+        
+        if not df_invest.empty:
+            maior_posicao = df_invest.loc[df_invest['Valor Investido'].idxmax()]
+            col3.metric(label="Maior Posição", value=maior_posicao['Código'], delta=formatar_valor_brl(maior_posicao['Valor Investido']), delta_color="off")
+        else:
+            col3.metric(label="Maior Posição", value="N/A")
+        
+        st.markdown("---")
+        st.subheader("Tabela Detalhada e Edição da Carteira")
+
+        exibir_editor_investimentos(cliente_selecionado, df_invest, versao_dados)
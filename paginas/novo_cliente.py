@@ -0,0 +1,50 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from dados import adicionar_cliente_na_planilha, invalidar_dados
+
+def exibir(df_clientes_geral):
+    st.header("Adicionar Novo Cliente")
+    
+    with st.form(key="novo_cliente_form"):
+        st.subheader("Dados Pessoais")
+        col1, col2 = st.columns(2)
+        with col1:
+            nome_cliente = st.text_input("Nome Completo*")
+            email_cliente = st.text_input("Email")
+        with col2:
+            celular_cliente = st.text_input("Celular (com DDD, ex: 21987654321)")
+            plano_cliente = st.selectbox("Plano*", ("Eleva", "Alavanca"))
+        
+        inicio_acompanhamento = st.date_input("Início do Acompanhamento*", datetime.now(), format="DD/MM/YYYY")
+
+        st.subheader("Carteira de Investimentos Inicial")
+        df_carteira_vazia = pd.DataFrame(columns=['Código', 'Quantidade', 'Preço Médio', 'Valor Investido'])
+        carteira_editada = st.data_editor(
+            df_carteira_vazia, 
+            num_rows="dynamic", 
+            use_container_width=True,
+            column_config={
+                "Preço Médio": st.column_config.NumberColumn("Preço Médio", format="R$ %.2f"),
+                "Valor Investido": st.column_config.NumberColumn("Valor Investido", format="R$ %.2f")
+            }
+        )
+        
+        submit_button = st.form_submit_button(label="Salvar Novo Cliente")
+
+    if submit_button:
+        emails_existentes = df_clientes_geral['Email'].str.strip().str.lower().tolist() if 'Email' in df_clientes_geral.columns else []
+        if not nome_cliente:
+            st.warning("O campo 'Nome Completo' é obrigatório.")
+        elif email_cliente and email_cliente.strip().lower() in emails_existentes:
+            st.error("Este email já está cadastrado. Por favor, utilize outro.")
+        else:
+            with st.spinner("A guardar novo cliente na planilha..."):
+                dados_novo_cliente = {"nome": nome_cliente, "celular": celular_cliente, "email": email_cliente, "plano": plano_cliente, "inicio": inicio_acompanhamento}
+                carteira_final = carteira_editada.dropna(how='all').copy()
+                sucesso = adicionar_cliente_na_planilha(dados_novo_cliente, carteira_final)
+                if sucesso:
+                    st.success(f"Cliente '{nome_cliente}' adicionado com sucesso!")
+                    st.balloons()
+                    invalidar_dados()
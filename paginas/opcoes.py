@@ -0,0 +1,101 @@
+import streamlit as st
+import pandas as pd
+
+from dados import identificar_tipo_opcao, ordenar_meses, atualizar_carteira_opcoes, construir_indice_filtros, mascara_indice, posicoes_mascara, fatiar_por_posicoes, invalidar_dados
+
+# --- DADOS DERIVADOS ---
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def preparar_opcoes_cliente(versao, cliente, _df_opcoes):
+    colunas_edicao = ['Situação', 'Ativo', 'Opção', 'Strike', 'Recomendação', 'Quantidade', 'Preço Executado', 'Mês']
+    df_para_editar_opcoes = _df_opcoes[colunas_edicao] if not _df_opcoes.empty else pd.DataFrame(columns=colunas_edicao)
+    indice = construir_indice_filtros(df_para_editar_opcoes, ['Situação', 'Ativo', 'Mês'])
+    return {
+        'df': df_para_editar_opcoes,
+        'indice': indice,
+        'situacoes': indice['valores']['Situação'],
+        'ativos': indice['valores']['Ativo'],
+        # O índice ordena alfabeticamente; os meses aparecem na ordem do calendário
+        'meses': ordenar_meses(indice['valores']['Mês']),
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def posicoes_opcoes_cliente(versao, cliente, _dados_opcoes, filtro_situacao, filtro_ativo, filtro_mes):
+    mascara = mascara_indice(_dados_opcoes['indice'], {'Situação': filtro_situacao, 'Ativo': filtro_ativo, 'Mês': filtro_mes})
+    return posicoes_mascara(mascara)
+
+def filtrar_opcoes_cliente(versao, cliente, dados_opcoes, filtro_situacao, filtro_ativo, filtro_mes):
+    posicoes = posicoes_opcoes_cliente(versao, cliente, dados_opcoes, filtro_situacao, filtro_ativo, filtro_mes)
+    return fatiar_por_posicoes(dados_opcoes['df'], posicoes)
+
+# --- FRAGMENTOS ---
+
+@st.fragment
+def exibir_editor_opcoes(cliente_selecionado_op, df_opcoes, versao):
+    dados_opcoes = preparar_opcoes_cliente(versao, cliente_selecionado_op, df_opcoes)
+    df_para_editar_opcoes = dados_opcoes['df']
+
+    # --- INÍCIO: NOVOS FILTROS PARA CARTEIRA DE OPÇÕES ---
+    with st.expander("🔍 Filtrar Opções"):
+        col1_op, col2_op, col3_op = st.columns(3)
+        with col1_op:
+            situacoes = dados_opcoes['situacoes']
+            filtro_situacao = st.multiselect("Situação", options=situacoes, default=situacoes, key=f"op_sit_{cliente_selecionado_op}")
+        with col2_op:
+            ativos = dados_opcoes['ativos']
+            filtro_ativo = st.multiselect("Ativo", options=ativos, default=ativos, key=f"op_atv_{cliente_selecionado_op}")
+        with col3_op:
+            meses = dados_opcoes['meses']
+            filtro_mes = st.multiselect("Mês", options=meses, default=meses, key=f"op_mes_{cliente_selecionado_op}")
+
+    df_opcoes_filtrado = filtrar_opcoes_cliente(
+        versao, cliente_selecionado_op, dados_opcoes,
+        tuple(filtro_situacao), tuple(filtro_ativo), tuple(filtro_mes)
+    )
+    # --- FIM: NOVOS FILTROS ---
+
+    with st.form(key="edicao_opcoes_inline"):
+        carteira_opcoes_para_editar = st.data_editor(
+            df_opcoes_filtrado, # Mostra o DataFrame filtrado
+            num_rows="dynamic",
+            use_container_width=True,
+            key=f"editor_opcoes_{cliente_selecionado_op}",
+            column_config={
+                "Strike": st.column_config.NumberColumn("Strike", format="R$ %.2f"),
+                "Preço Executado": st.column_config.NumberColumn("Preço Executado", format="R$ %.2f")
+            }
+        )
+
+        submitted_opcoes = st.form_submit_button("Salvar Alterações na Carteira de Opções")
+        if submitted_opcoes:
+            with st.spinner("A atualizar carteira de opções..."):
+                # --- INÍCIO: LÓGICA DE ATUALIZAÇÃO SEGURA COM FILTROS ---
+                df_base_op = df_para_editar_opcoes.copy()
+                df_base_op.update(carteira_opcoes_para_editar)
+                novas_linhas_op = carteira_opcoes_para_editar[~carteira_opcoes_para_editar.index.isin(df_base_op.index)]
+                df_final_op = pd.concat([df_base_op, novas_linhas_op])
+                linhas_deletadas_op = df_base_op.index[~df_base_op.index.isin(carteira_opcoes_para_editar.index)]
+                df_final_op.drop(linhas_deletadas_op, inplace=True)
+                # --- FIM: LÓGICA DE ATUALIZAÇÃO ---
+
+                df_final_op['Tipo'] = df_final_op['Opção'].apply(identificar_tipo_opcao)
+                sucesso = atualizar_carteira_opcoes(cliente_selecionado_op, df_final_op)
+                if sucesso:
+                    st.success("Carteira de opções atualizada com sucesso!")
+                    invalidar_dados()
+                    st.rerun()
+                else:
+                    st.error("Falha ao atualizar a carteira de opções.")
+
+# --- PÁGINA ---
+
+def exibir(df_clientes, dados_carteiras, versao_dados):
+    st.header("Análise da Carteira de Opções")
+    cliente_selecionado_op = st.sidebar.selectbox("Selecione um Cliente", options=df_clientes['Nome'].unique(), key="cliente_opcoes")
+    st.sidebar.caption("Clique na caixa e digite para pesquisar.")
+    if cliente_selecionado_op:
+        df_opcoes = dados_carteiras.get(cliente_selecionado_op, {}).get('opcoes', pd.DataFrame())
+        
+        st.subheader("Tabela Detalhada e Edição da Carteira de Opções")
+
+        exibir_editor_opcoes(cliente_selecionado_op, df_opcoes, versao_dados)
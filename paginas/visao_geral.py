@@ -0,0 +1,124 @@
+import streamlit as st
+import pandas as pd
+from datetime import date
+
+from dados import formatar_valor_brl, atualizar_lista_clientes, invalidar_dados
+from nucleo.regras import preparar_contratos
+
+# --- DADOS DERIVADOS ---
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def calcular_patrimonio_total(versao, _df_clientes, _dados_carteiras):
+    return sum(_dados_carteiras[nome]['investimentos']['Valor Investido'].sum() for nome in _df_clientes['Nome'] if nome in _dados_carteiras and not _dados_carteiras[nome]['investimentos'].empty)
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def preparar_lista_clientes(versao, _df_clientes, hoje):
+    df_clientes_display = preparar_contratos(_df_clientes, hoje)
+
+    colunas_para_exibir = ['Nome', 'Celular', 'Email', 'Plano', 'Início do Acompanhamento', 'Vencimento do Contrato', 'Ação']
+    return df_clientes_display[colunas_para_exibir]
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def filtrar_lista_clientes(versao, _df_para_editar, hoje, filtro_nome, filtro_email, filtro_plano):
+    df_filtrado = _df_para_editar
+    if filtro_nome:
+        df_filtrado = df_filtrado[df_filtrado['Nome'].str.contains(filtro_nome, case=False, na=False)]
+    if filtro_email:
+        df_filtrado = df_filtrado[df_filtrado['Email'].str.contains(filtro_email, case=False, na=False)]
+    if filtro_plano:
+        df_filtrado = df_filtrado[df_filtrado['Plano'].isin(filtro_plano)]
+    return df_filtrado
+
+# --- FRAGMENTOS ---
+
+@st.fragment
+def exibir_lista_clientes(df_clientes, df_para_editar, versao):
+    colunas_para_exibir = list(df_para_editar.columns)
+
+    # --- INÍCIO: NOVOS FILTROS PARA LISTA DE CLIENTES ---
+    with st.expander("🔍 Filtrar Clientes"):
+        col1_filtro, col2_filtro, col3_filtro = st.columns(3)
+        with col1_filtro:
+            filtro_nome = st.text_input("Buscar por Nome", key="filtro_nome_geral")
+        with col2_filtro:
+            filtro_email = st.text_input("Buscar por Email", key="filtro_email_geral")
+        with col3_filtro:
+            planos_unicos = df_para_editar['Plano'].dropna().unique()
+            filtro_plano = st.multiselect("Filtrar por Plano", options=planos_unicos, default=list(planos_unicos), key="filtro_plano_geral")
+
+    df_filtrado = filtrar_lista_clientes(versao, df_para_editar, date.today(), filtro_nome, filtro_email, tuple(filtro_plano))
+    # --- FIM: NOVOS FILTROS ---
+
+    with st.form(key="edicao_clientes_form"):
+        st.markdown("Adicione, remova ou edite os clientes na tabela abaixo. As alterações serão salvas corretamente mesmo com filtros aplicados.")
+
+        clientes_editados = st.data_editor(
+            df_filtrado, # Mostra o DataFrame filtrado
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Início do Acompanhamento": st.column_config.DateColumn("Início", format="DD/MM/YYYY", disabled=True),
+                "Vencimento do Contrato": st.column_config.DateColumn("Vencimento", format="DD/MM/YYYY", required=True),
+                "Ação": st.column_config.LinkColumn("Ação", display_text="Contatar 📞", disabled=True),
+                "Nome": st.column_config.TextColumn(required=True)
+            },
+            key="editor_clientes"
+        )
+
+        submitted = st.form_submit_button("Salvar Alterações na Lista de Clientes")
+
+    if submitted:
+        with st.spinner("A atualizar lista de clientes..."):
+            # --- INÍCIO: NOVA LÓGICA DE ATUALIZAÇÃO SEGURA COM FILTROS ---
+            # Pega o dataframe original (antes de filtrar e editar) e atualiza com os dados editados
+            df_original_com_indices = df_para_editar.reset_index()
+            clientes_editados_com_indices = clientes_editados.reset_index()
+
+            # Faz o merge para identificar as linhas alteradas e novas
+            df_merged = pd.merge(df_original_com_indices, clientes_editados_com_indices, how='right', on='index', suffixes=('_original', ''))
+
+            # Para as linhas que já existiam, usa os novos valores
+            for col in colunas_para_exibir:
+                 if col in df_merged.columns:
+                    df_clientes.loc[df_merged['index'], col] = df_merged[col]
+
+            # Adiciona novas linhas (se houver)
+            novas_linhas = clientes_editados[~clientes_editados.index.isin(df_para_editar.index)]
+            df_final_para_salvar = pd.concat([df_clientes, novas_linhas]).drop_duplicates(subset=['Nome', 'Email'], keep='last')
+            # --- FIM: NOVA LÓGICA DE ATUALIZAÇÃO ---
+
+            sucesso = atualizar_lista_clientes(df_final_para_salvar)
+            if sucesso:
+                st.success("Lista de clientes atualizada com sucesso!")
+                invalidar_dados()
+                st.rerun()
+
+# --- PÁGINA ---
+
+def exibir(df_clientes, dados_carteiras, versao_dados):
+    st.header("Visão Geral dos Clientes")
+    patrimonio_total = calcular_patrimonio_total(versao_dados, df_clientes, dados_carteiras)
+    total_clientes = len(df_clientes)
+    col1, col2 = st.columns(2)
+    col1.metric(label="Total de Clientes", value=total_clientes)
+    col2.metric(label="Patrimônio Total Investido", value=formatar_valor_brl(patrimonio_total))
+    st.markdown("---")
+    # Importado aqui, e não no topo: o cabeçalho e as métricas já seguem para
+    # o navegador enquanto o Plotly carrega na primeira execução do processo
+    import plotly.express as px
+    col_graf1, col_graf2 = st.columns(2)
+    with col_graf1:
+        fig_plano = px.pie(df_clientes, names='Plano', title='Distribuição de Clientes por Plano', hole=0.4, 
+                           color_discrete_sequence=['#075025', '#0C773C', '#BE9D5B'])
+        st.plotly_chart(fig_plano, use_container_width=True)
+    with col_graf2:
+        df_clientes_por_data = df_clientes.dropna(subset=['Início do Acompanhamento']).set_index('Início do Acompanhamento').resample('ME').size().reset_index(name='Novos Clientes')
+        fig_evolucao = px.line(df_clientes_por_data, x='Início do Acompanhamento', y='Novos Clientes', title='Evolução de Inícios de Acompanhamento', markers=True)
+        fig_evolucao.update_traces(line_color='#0C773C', marker_color='#BE9D5B')
+        st.plotly_chart(fig_evolucao, use_container_width=True)
+    
+    st.subheader("Lista de Clientes")
+
+    df_para_editar = preparar_lista_clientes(versao_dados, df_clientes, date.today())
+    exibir_lista_clientes(df_clientes, df_para_editar, versao_dados)
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class AbaFalsa:
+    """Aba do gspread em memória: só as colunas A:D da carteira e as chamadas que a escrita usa."""
+
+    def __init__(self, linhas, row_count=None):
+        self.linhas = [list(linha) + [''] * (4 - len(linha)) for linha in linhas]
+        self.row_count = row_count if row_count is not None else len(self.linhas)
+        self.chamadas_batch_update = []
+        self.linhas_adicionadas = []
+
+    def col_values(self, coluna):
+        valores = [linha[coluna - 1] for linha in self.linhas]
+        # Como o gspread, não devolve as células vazias do fim da coluna
+        while valores and valores[-1] == '':
+            valores.pop()
+        return valores
+
+    def add_rows(self, quantidade):
+        self.linhas_adicionadas.append(quantidade)
+        self.row_count += quantidade
+
+    def batch_update(self, dados, value_input_option=None):
+        self.chamadas_batch_update.append(dados)
+        for item in dados:
+            inicio, fim = item['range'].split(':')
+            linha = int(inicio[1:])
+            assert inicio[0] == 'A' and fim == f'D{linha}'
+            assert linha <= self.row_count, "escrita além do fim da grade"
+            while len(self.linhas) < linha:
+                self.linhas.append([''] * 4)
+            self.linhas[linha - 1] = list(item['values'][0])
+
+
+class PlanilhaFalsa:
+    def __init__(self, abas):
+        self.abas = abas
+
+    def worksheet(self, titulo):
+        return self.abas[titulo]
+
+
+@pytest.fixture
+def planilha_falsa(monkeypatch):
+    """Troca a conexão do dados.py por uma planilha em memória; devolve a função que registra abas."""
+    import dados
+
+    abas = {}
+    monkeypatch.setattr(dados, 'conectar_gsheets', lambda: PlanilhaFalsa(abas))
+
+    def registrar(titulo, linhas, row_count=None):
+        abas[titulo] = AbaFalsa(linhas, row_count)
+        return abas[titulo]
+
+    return registrar
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+import dados
+from dados import (DIMENSOES_CUBO, anotar_carga_cubo, construir_cubo_exposicao, cubo_exposicao_da_versao,
+                   invalidar_dados, registrar_opcoes_gravadas, registro_cubo_exposicao)
+
+
+def pernas(linhas):
+    """Pernas no formato de df_todas_opcoes: (cliente, ativo, quantidade), uma por linha, agrupadas por cliente."""
+    return pd.DataFrame({
+        'Cliente': [cliente for cliente, _, _ in linhas],
+        'Ativo': [ativo for _, ativo, _ in linhas],
+        'Tipo': ['Call'] * len(linhas),
+        'Data de Vencimento': pd.to_datetime(['2026-11-20'] * len(linhas)),
+        'Situação': ['Aberta'] * len(linhas),
+        'Quantidade': pd.array([quantidade for _, _, quantidade in linhas], dtype='Int64'),
+        'Strike': [30.0] * len(linhas),
+        'Preço Executado': [1.0] * len(linhas),
+    })
+
+
+def ordenado(cubo):
+    return cubo.sort_values(DIMENSOES_CUBO).reset_index(drop=True)
+
+
+@pytest.fixture
+def montagens(monkeypatch):
+    """Zera o cubo partilhado e conta as montagens do zero."""
+    registro_cubo_exposicao.clear()
+    chamadas = []
+
+    def construir(df_todas_opcoes):
+        chamadas.append(len(df_todas_opcoes))
+        return construir_cubo_exposicao(df_todas_opcoes)
+
+    monkeypatch.setattr(dados, 'construir_cubo_exposicao', construir)
+    yield chamadas
+    registro_cubo_exposicao.clear()
+
+
+def test_gravacao_de_opcoes_reagrega_so_o_cliente_gravado(montagens):
+    cubo_exposicao_da_versao('v1', pernas([('X', 'PETR4', 100), ('X', 'VALE3', 200), ('Y', 'PETR4', 300)]))
+
+    registrar_opcoes_gravadas('Y')
+    anotar_carga_cubo()
+    relidas = pernas([('X', 'PETR4', 100), ('X', 'VALE3', 200), ('Y', 'PETR4', 300), ('Y', 'BBAS3', 50)])
+    cubo = cubo_exposicao_da_versao('v2', relidas)
+
+    assert montagens == [3]
+    pd.testing.assert_frame_equal(ordenado(cubo), ordenado(construir_cubo_exposicao(relidas)))
+
+
+def test_edicao_por_fora_de_outro_cliente_monta_do_zero(montagens):
+    cubo_exposicao_da_versao('v1', pernas([('X', 'PETR4', 100), ('Y', 'PETR4', 300)]))
+
+    # X muda por fora da aplicação, com o mesmo número de pernas; o dashboard grava Y
+    registrar_opcoes_gravadas('Y')
+    anotar_carga_cubo()
+    relidas = pernas([('X', 'PETR4', 900), ('Y', 'PETR4', 400)])
+    cubo = cubo_exposicao_da_versao('v2', relidas)
+
+    assert montagens == [2, 2]
+    assert cubo.loc[cubo['Cliente'] == 'X', 'Quantidade'].tolist() == [900]
+    pd.testing.assert_frame_equal(ordenado(cubo), ordenado(construir_cubo_exposicao(relidas)))
+
+
+def test_outras_gravacoes_nao_reaproveitam_o_cubo(montagens):
+    cubo_exposicao_da_versao('v1', pernas([('X', 'PETR4', 100)]))
+
+    # Gravação de investimentos ou da lista de clientes: só invalida os dados
+    invalidar_dados()
+    anotar_carga_cubo()
+    assert registro_cubo_exposicao()['cubo'] is None
+
+    cubo_exposicao_da_versao('v2', pernas([('X', 'PETR4', 100)]))
+    assert montagens == [1, 1]
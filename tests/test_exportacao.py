@@ -0,0 +1,68 @@
+import csv
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+from exportacao import FORMATOS_EXPORTACAO, exportar_para_bytes
+
+
+def dados_exemplo():
+    opcoes = pd.DataFrame({
+        'Mês': ['Novembro', 'Dezembro'], 'Situação': ['Aberta', 'Fechada'], 'Ativo': ['PETR4', 'VALE3'],
+        'Opção': ['PETRK30', 'VALEL60'], 'Tipo': ['Call', 'Call'], 'Strike': [30.0, 60.0],
+        'Recomendação': ['Venda', 'Venda'], 'Quantidade': pd.array([100, None], dtype='Int64'),
+        'Preço Executado': [1.0, 2.5],
+    })
+    dados_carteiras = {
+        'Ana': {
+            'investimentos': pd.DataFrame({'Código': ['PETR4'], 'Quantidade': pd.array([100], dtype='Int64'),
+                                           'Preço Médio': [10.0], 'Valor Investido': [1000.0]}),
+            'opcoes': opcoes,
+        },
+        'Bia': {'investimentos': pd.DataFrame(), 'opcoes': pd.DataFrame()},
+    }
+    df_todas_opcoes = opcoes.assign(Cliente='Ana', **{'Data de Vencimento': pd.to_datetime(['2026-11-20', '2026-12-18'])})
+    return dados_carteiras, df_todas_opcoes
+
+
+def baixar_pelo_botao(formato, dados_carteiras, df_todas_opcoes):
+    """Segue o caminho do st.download_button com data=callable: o callable só roda no clique."""
+    armazenamento = MemoryMediaFileStorage('/media')
+    gerenciador = MediaFileManager(armazenamento)
+    file_id = gerenciador.add_deferred(
+        lambda: exportar_para_bytes(formato, dados_carteiras, df_todas_opcoes),
+        FORMATOS_EXPORTACAO[formato]['mime'], 'barra_lateral', file_name=f"carteiras.{FORMATOS_EXPORTACAO[formato]['extensao']}"
+    )
+    url = gerenciador.execute_deferred(file_id)
+    return armazenamento.get_file(url.rsplit('/', 1)[-1]).content
+
+
+@pytest.mark.parametrize('formato', sorted(FORMATOS_EXPORTACAO))
+def test_exportacao_do_dashboard_devolve_bytes(formato):
+    assert isinstance(exportar_para_bytes(formato, *dados_exemplo()), bytes)
+
+
+def test_download_excel_pelo_botao():
+    from openpyxl import load_workbook
+
+    conteudo = baixar_pelo_botao('xlsx', *dados_exemplo())
+
+    workbook = load_workbook(io.BytesIO(conteudo), read_only=True)
+    assert workbook.sheetnames == ['Investimentos', 'Opções', 'Todas as Opções']
+    linhas = list(workbook['Opções'].values)
+    assert linhas[0][:3] == ('Cliente', 'Mês', 'Situação')
+    assert len(linhas) == 3 and linhas[2][8] is None
+
+
+def test_download_csv_pelo_botao():
+    conteudo = baixar_pelo_botao('csv', *dados_exemplo())
+
+    with zipfile.ZipFile(io.BytesIO(conteudo)) as arquivo_zip:
+        assert sorted(arquivo_zip.namelist()) == ['Investimentos.csv', 'Opções.csv', 'Todas as Opções.csv']
+        texto = arquivo_zip.read('Investimentos.csv').decode('utf-8-sig')
+    linhas = list(csv.reader(io.StringIO(texto), delimiter=';'))
+    assert linhas == [['Cliente', 'Código', 'Quantidade', 'Preço Médio', 'Valor Investido'], ['Ana', 'PETR4', '100', '10.0', '1000.0']]
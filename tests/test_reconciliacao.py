@@ -0,0 +1,126 @@
+import pandas as pd
+import pytest
+
+from dados import atualizar_carteira_investimentos, codigos_duplicados, reconciliar_carteira
+
+CABECALHO = ['CÓDIGO', 'QUANTIDADE', 'PM', 'VALOR INVESTIDO']
+
+
+def carteira(codigos, quantidades=None):
+    """Carteira no formato devolvido pelo carregamento da planilha."""
+    quantidades = list(range(1, len(codigos) + 1)) if quantidades is None else quantidades
+    return pd.DataFrame({
+        'Código': codigos,
+        'Quantidade': pd.array(quantidades, dtype='Int64'),
+        'Preço Médio': [10.5] * len(codigos),
+        'Valor Investido': [q * 10.5 for q in quantidades],
+    })
+
+
+def linhas_planilha(df):
+    return [CABECALHO] + [[codigo, str(q), '10,50', ''] for codigo, q in zip(df['Código'], df['Quantidade'])]
+
+
+def test_carteira_grande_grava_so_as_linhas_alteradas(planilha_falsa):
+    total = 200_000
+    original = carteira([f'A{i:06d}' for i in range(total)])
+    aba = planilha_falsa('Cliente', linhas_planilha(original))
+
+    editada = original.copy()
+    for posicao in (10, 100_000, 199_999):
+        editada.loc[posicao, 'Quantidade'] += 1
+    editada = editada.drop(index=[5, 150_000])
+    editada = pd.concat([editada, carteira(['NOVO1', 'NOVO2', 'NOVO3'], [7, 8, 9])], ignore_index=True)
+
+    alteracoes = reconciliar_carteira(original, editada)
+    assert alteracoes['atualizadas'].index.tolist() == ['A000010', 'A100000', 'A199999']
+    assert alteracoes['inseridas'].index.tolist() == ['NOVO1', 'NOVO2', 'NOVO3']
+    assert sorted(alteracoes['removidas']) == ['A000005', 'A150000']
+
+    assert atualizar_carteira_investimentos('Cliente', alteracoes) is True
+
+    # Uma única chamada: três atualizações no lugar, duas inserções nas linhas
+    # liberadas pelas remoções e uma no fim, depois de crescer a grade
+    assert len(aba.chamadas_batch_update) == 1
+    intervalos = [item['range'] for item in aba.chamadas_batch_update[0]]
+    assert intervalos == ['A7:D7', 'A12:D12', 'A100002:D100002', 'A150002:D150002', 'A200001:D200001', 'A200002:D200002']
+    assert aba.linhas_adicionadas == [1]
+
+    assert aba.linhas[11][:2] == ['A000010', '12']
+    assert aba.linhas[6][0] == 'NOVO1' and aba.linhas[150_001][0] == 'NOVO2' and aba.linhas[200_001][0] == 'NOVO3'
+    codigos_gravados = aba.col_values(1)
+    assert 'A000005' not in codigos_gravados and 'A150000' not in codigos_gravados
+    assert len(codigos_gravados) == total + 2
+
+
+def test_remocao_deixa_linha_em_branco_sem_crescer_a_grade(planilha_falsa):
+    original = carteira(['A', 'B', 'C'])
+    aba = planilha_falsa('Cliente', linhas_planilha(original), row_count=100)
+
+    alteracoes = reconciliar_carteira(original, original[original['Código'] != 'B'])
+    assert atualizar_carteira_investimentos('Cliente', alteracoes) is True
+
+    assert [item['range'] for item in aba.chamadas_batch_update[0]] == ['A3:D3']
+    assert aba.linhas[2] == [''] * 4
+    assert aba.linhas_adicionadas == []
+
+
+def test_insercoes_em_grade_cheia_adicionam_so_as_linhas_necessarias(planilha_falsa):
+    original = carteira(['A', 'B'])
+    aba = planilha_falsa('Cliente', linhas_planilha(original))
+
+    editada = pd.concat([original, carteira(['C', 'D'])], ignore_index=True)
+    assert atualizar_carteira_investimentos('Cliente', reconciliar_carteira(original, editada)) is True
+
+    assert aba.linhas_adicionadas == [2]
+    assert aba.col_values(1) == ['CÓDIGO', 'A', 'B', 'C', 'D']
+
+
+def test_sem_alteracoes_nao_escreve(planilha_falsa):
+    original = carteira(['A', 'B'])
+    aba = planilha_falsa('Cliente', linhas_planilha(original))
+
+    alteracoes = reconciliar_carteira(original, original.copy())
+    assert atualizar_carteira_investimentos('Cliente', alteracoes) is True
+    assert aba.chamadas_batch_update == []
+
+
+def test_codigo_repetido_e_recusado_na_reconciliacao():
+    original = carteira(['X', 'X', 'Y'], [1, 2, 3])
+    editada = original.copy()
+    editada.loc[0, 'Quantidade'] = 5
+
+    assert codigos_duplicados(original) == ['X']
+    assert codigos_duplicados(original[original['Código'] != 'X']) == []
+    with pytest.raises(ValueError, match='X'):
+        reconciliar_carteira(original, editada)
+
+
+def test_codigo_repetido_na_aba_nao_e_gravado(planilha_falsa):
+    # A aba tem X nas linhas 2 e 3; a edição de X não pode cair na linha errada
+    aba = planilha_falsa('Cliente', [CABECALHO, ['X', '1', '10,50', ''], ['X', '2', '10,50', ''], ['Y', '3', '10,50', '']])
+    alteracoes = reconciliar_carteira(carteira(['X'], [2]), carteira(['X'], [9]))
+
+    assert atualizar_carteira_investimentos('Cliente', alteracoes) is False
+    assert aba.chamadas_batch_update == []
+    assert [linha[:2] for linha in aba.linhas[1:3]] == [['X', '1'], ['X', '2']]
+
+
+def test_codigo_repetido_nao_impede_gravar_outros_codigos(planilha_falsa):
+    aba = planilha_falsa('Cliente', [CABECALHO, ['X', '1', '10,50', ''], ['X', '2', '10,50', ''], ['Y', '3', '10,50', '']])
+    alteracoes = reconciliar_carteira(carteira(['Y'], [3]), carteira(['Y'], [4]))
+
+    assert atualizar_carteira_investimentos('Cliente', alteracoes) is True
+    assert [item['range'] for item in aba.chamadas_batch_update[0]] == ['A4:D4']
+
+
+def test_insercao_de_codigo_escondido_pelo_filtro_nao_grava_por_cima(planilha_falsa):
+    # Com o filtro "PETR" o editor mostra só PETR4; o usuário adiciona VALE3, que já existe na aba
+    aba = planilha_falsa('Cliente', [CABECALHO, ['PETR4', '100', '10,50', ''], ['VALE3', '50', '60,00', '']])
+    mostrada = carteira(['PETR4'], [100])
+    alteracoes = reconciliar_carteira(mostrada, pd.concat([mostrada, carteira(['VALE3'], [1])], ignore_index=True))
+    assert alteracoes['inseridas'].index.tolist() == ['VALE3']
+
+    assert atualizar_carteira_investimentos('Cliente', alteracoes) is False
+    assert aba.chamadas_batch_update == []
+    assert aba.linhas[2][:3] == ['VALE3', '50', '60,00']
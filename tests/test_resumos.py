@@ -0,0 +1,90 @@
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+import dados
+from nucleo.planilha import carregar_instantaneo_recente, gravar_instantaneo, ler_instantaneo
+from nucleo.resumos import gerar_resumos, gravar_resumos
+
+
+def conjunto_exemplo():
+    df_clientes = pd.DataFrame({
+        'Nome': ['Ana', 'Bia'], 'Celular': ['21999990000', ''], 'Email': ['ana@exemplo.com', 'bia@exemplo.com'],
+        'Plano': ['Eleva', 'Alavanca'],
+        'Início do Acompanhamento': pd.to_datetime(['2025-11-01', '2025-01-10']),
+        'Vencimento do Contrato': pd.to_datetime(['2026-11-01', '2027-01-10']),
+    })
+    opcoes = pd.DataFrame({
+        'Mês': ['Novembro'], 'Situação': ['Aberta'], 'Ativo': ['PETR4'], 'Opção': ['PETRK30'], 'Tipo': ['Call'],
+        'Strike': [30.0], 'Recomendação': ['Venda'], 'Quantidade': pd.array([100], dtype='Int64'), 'Preço Executado': [1.0],
+    })
+    carteiras = {'Ana': {'investimentos': pd.DataFrame(), 'opcoes': opcoes}, 'Bia': {'investimentos': pd.DataFrame(), 'opcoes': pd.DataFrame()}}
+    df_todas_opcoes = opcoes.assign(Cliente='Ana', **{'Data de Vencimento': pd.to_datetime(['2026-11-20'])})
+    return df_clientes, carteiras, df_todas_opcoes
+
+
+def test_instantaneo_guarda_o_conjunto_lido(tmp_path):
+    df_clientes, carteiras, df_todas_opcoes = conjunto_exemplo()
+    lido_em = datetime(2026, 10, 19, 6, 0)
+    caminho = gravar_instantaneo(str(tmp_path / 'saida' / 'instantaneo.pkl'), df_clientes, carteiras, df_todas_opcoes, lido_em)
+
+    lidos = ler_instantaneo(caminho)
+    pd.testing.assert_frame_equal(lidos[0], df_clientes)
+    pd.testing.assert_frame_equal(lidos[1]['Ana']['opcoes'], carteiras['Ana']['opcoes'])
+    pd.testing.assert_frame_equal(lidos[2], df_todas_opcoes)
+    assert sorted(lidos[1]) == ['Ana', 'Bia'] and lidos[3] == lido_em
+    assert [p.name for p in (tmp_path / 'saida').iterdir()] == ['instantaneo.pkl']
+
+
+def test_resumos_da_janela_gravados_por_dia(tmp_path):
+    df_clientes, _, df_todas_opcoes = conjunto_exemplo()
+    hoje = date(2026, 10, 19)
+
+    resumos = gerar_resumos(df_clientes, df_todas_opcoes, hoje, dias=35)
+    assert resumos['vencimentos_opcoes']['Opção'].tolist() == ['PETRK30']
+    assert resumos['renovacoes_contratos']['Nome'].tolist() == ['Ana']
+
+    caminhos = gravar_resumos(str(tmp_path), resumos, hoje)
+    assert sorted(p.rsplit('/', 1)[-1] for p in caminhos) == ['renovacoes_contratos_2026-10-19.csv', 'vencimentos_opcoes_2026-10-19.csv']
+
+
+def test_so_instantaneo_recente_e_posterior_a_gravacao_e_usado(tmp_path):
+    caminho = str(tmp_path / 'instantaneo.pkl')
+    assert carregar_instantaneo_recente(caminho) is None
+
+    lido_em = datetime.now() - timedelta(minutes=1)
+    gravar_instantaneo(caminho, *conjunto_exemplo(), lido_em)
+    assert carregar_instantaneo_recente(caminho)[0]['Nome'].tolist() == ['Ana', 'Bia']
+    assert carregar_instantaneo_recente(caminho, posterior_a=lido_em - timedelta(seconds=1)) is not None
+    # Gravação feita depois da leitura: o instantâneo não a tem
+    assert carregar_instantaneo_recente(caminho, posterior_a=lido_em + timedelta(seconds=1)) is None
+    assert carregar_instantaneo_recente(caminho, idade_maxima=timedelta(seconds=30)) is None
+
+    gravar_instantaneo(caminho, *conjunto_exemplo(), datetime.now() - timedelta(hours=1))
+    assert carregar_instantaneo_recente(caminho) is None
+
+
+def test_dashboard_carrega_o_instantaneo_ate_a_proxima_gravacao(tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'instantaneo.pkl')
+    gravar_instantaneo(caminho, *conjunto_exemplo(), datetime.now())
+    leituras = []
+
+    def conectar():
+        leituras.append(1)
+        raise ConnectionError("sem planilha no teste")
+
+    monkeypatch.setattr(dados, 'CAMINHO_INSTANTANEO', caminho)
+    monkeypatch.setattr(dados, 'conectar_gsheets', conectar)
+    dados.registro_gravacoes.clear()
+    dados.carregar_conjunto_compartilhado.clear()
+    try:
+        df_clientes, carteiras, _, versao = dados.carregar_conjunto_compartilhado()
+        assert df_clientes['Nome'].tolist() == ['Ana', 'Bia'] and versao is not None and leituras == []
+
+        # Depois de uma gravação do dashboard o instantâneo já não serve: relê a planilha
+        dados.invalidar_dados()
+        df_clientes, _, _, versao = dados.carregar_conjunto_compartilhado()
+        assert leituras == [1] and df_clientes.empty and versao is None
+    finally:
+        dados.registro_gravacoes.clear()
+        dados.carregar_conjunto_compartilhado.clear()